@@ -18,6 +18,12 @@ def not_found(e):
     return jsonify(error="Not found"), 404
 
 
+@app.before_request
+def begin_scope():
+    """Let storage remember the objects it finds during the request."""
+    storage.begin_scope()
+
+
 @app.teardown_appcontext
 def teardown_everything(self):
     """Close database."""
@@ -9,6 +9,7 @@ Views:
     - User [GET/PUT/POST/DELETE]
     - Place [GET/PUT/POST/DELETE]
     - Reviews [GET/PUT/POST/DELETE]
+    - batch creation of any of the above [POST]
 
 Default route prefix: /api/v1
 """
@@ -24,3 +25,4 @@ from api.v1.views.amenities import *
 from api.v1.views.users import *
 from api.v1.views.places import *
 from api.v1.views.places_reviews import *
+from api.v1.views.batch import *
@@ -4,17 +4,16 @@
 from models import storage
 from flask import Flask, jsonify, request, abort
 from api.v1.views import app_views
+from api.v1.views.cache import cached_response, invalidate
+from api.v1.views.pagination import paginate
 from models.base_model import BaseModel
 from models.user import User
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def ret_all_users():
-    """Retrieve a list of all User object dictionaries"""
-    all_users = []
-    for obj in storage.all(User).values():
-        all_users.append(obj.to_dict())
-    return jsonify(all_users)
+    """Retrieve a page of the list of all User object dictionaries"""
+    return paginate(User)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'],
@@ -23,10 +22,7 @@ def ret_amenity(user_id):
     """Retrieve a specific user dictionary.
     Raise 404 error if user_id is not linked to a User object.
     """
-    obj = storage.get(User, user_id)
-    if obj is None:
-        abort(404)
-    return jsonify(obj.to_dict())
+    return cached_response(User, user_id)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'],
@@ -41,6 +37,7 @@ def delete_user(user_id):
         abort(404)
     storage.delete(obj)
     storage.save()
+    invalidate(User, user_id)
     return jsonify({}), 200
 
 
@@ -62,6 +59,7 @@ def add_user():
         obj = User(**user_input)
         storage.new(obj)
         storage.save()
+        invalidate(User, obj.id)
         user_obj = obj.to_dict()
         return jsonify(user_obj), 201
     abort(404)
@@ -82,4 +80,5 @@ def update_user(user_id):
         if k not in ['id', 'created_at', 'updated_at', 'email']:
             setattr(obj, k, v)
     obj.save()
+    invalidate(User, user_id)
     return jsonify(obj.to_dict()), 200
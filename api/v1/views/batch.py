@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+""" This module handles the creation of many objects in one request.
+Routes:
+    /<resource>/batch [POST] - Create the objects of a JSON list, where
+    resource is states, cities, amenities, users, places or reviews.
+"""
+from models import storage
+from flask import jsonify, request, abort
+from api.v1.views import app_views
+from api.v1.views.cache import invalidate
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from os import getenv
+
+# resource -> (class, required attributes, parent class by foreign key)
+resources = {
+    "states": (State, ("name",), {}),
+    "cities": (City, ("state_id", "name"), {"state_id": State}),
+    "amenities": (Amenity, ("name",), {}),
+    "users": (User, ("email", "password"), {}),
+    "places": (Place, ("city_id", "user_id", "name"),
+               {"city_id": City, "user_id": User}),
+    "reviews": (Review, ("place_id", "user_id", "text"),
+                {"place_id": Place, "user_id": User}),
+}
+batch_max = int(getenv('HBNB_API_BATCH_MAX', 10000))
+
+
+@app_views.route('/<resource>/batch', methods=['POST'], strict_slashes=False)
+def add_batch(resource):
+    """Create one object per dictionary of the JSON list in the request
+    body, and add them all to storage at once.
+    Raise error 400 if the body is not a JSON list, holds more than
+    HBNB_API_BATCH_MAX objects, or if an object misses a required
+    attribute or links another object by anything but an id string,
+    404 if the resource or a linked object does not exist.
+    id, created_at and updated_at are ignored, as in PUT requests.
+    Return the list of new objects with status code 201.
+    """
+    if resource not in resources:
+        abort(404)
+    cls, required, parents = resources[resource]
+    user_input = request.get_json(silent=True)
+    if type(user_input) is not list:
+        abort(400, {'message': 'Not a JSON list'})
+    if len(user_input) > batch_max:
+        abort(400, {'message': 'Too many objects'})
+    ids = {attr: set() for attr in parents}
+    items = []
+    for item in user_input:
+        if type(item) is not dict:
+            abort(400, {'message': 'Not a JSON'})
+        item = {k: v for k, v in item.items()
+                if k not in ['id', 'created_at', 'updated_at']}
+        items.append(item)
+        for attr in required:
+            if item.get(attr) is None:
+                abort(400, {'message': 'Missing {}'.format(attr)})
+        for attr in parents:
+            if type(item[attr]) is not str:
+                abort(400, {'message': 'Invalid {}'.format(attr)})
+            ids[attr].add(item[attr])
+    for attr, parent in parents.items():
+        if len(storage.get_many(parent, ids[attr])) < len(ids[attr]):
+            abort(404)
+    objs = storage.bulk_new(cls(**item) for item in items)
+    for obj in objs:
+        invalidate(cls, obj.id)
+    return jsonify([obj.to_dict() for obj in objs]), 201
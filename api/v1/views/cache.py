@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Response cache of the routes returning one object.
+The JSON body of GET /<resource>/<id> is kept, for at most
+HBNB_API_CACHE_SIZE objects (least recently used out first, 0 to keep
+none), with the to_dict() of the object it was encoded from. The object
+is still read from storage on every request, but only encoded again once
+one of its attributes changed, whichever process wrote it: updated_at
+alone is not enough, MySQL DATETIME columns drop its microseconds. The
+views also drop the entry when they update or delete the object.
+Responses carry an ETag: a request whose If-None-Match holds it gets a
+304 without body.
+"""
+from collections import OrderedDict
+from flask import current_app, jsonify, abort, request
+import hashlib
+from models import storage
+from os import getenv
+import threading
+
+cache_size = int(getenv('HBNB_API_CACHE_SIZE', 1024))
+# (class name, id) -> (to_dict(), body, etag), most recently used last
+responses = OrderedDict()
+responses_lock = threading.Lock()
+
+
+def cached_response(cls, obj_id):
+    """Return the dictionary of the cls object of id obj_id, or a 304
+    response if the request already has it.
+    Raise 404 error if obj_id is not linked to a cls object."""
+    obj = storage.get(cls, obj_id)
+    if obj is None:
+        abort(404)
+    key = (cls.__name__, obj_id)
+    with responses_lock:
+        cached = responses.get(key)
+        if cached is not None:
+            responses.move_to_end(key)
+    obj_dict = obj.to_dict()
+    if cached is not None and cached[0] == obj_dict:
+        response = current_app.response_class(
+            cached[1], mimetype=current_app.json.mimetype)
+    else:
+        response = jsonify(obj_dict)
+        body = response.get_data()
+        cached = (obj_dict, body, hashlib.sha1(body).hexdigest())
+        if cache_size > 0:
+            with responses_lock:
+                responses[key] = cached
+                responses.move_to_end(key)
+                while len(responses) > cache_size:
+                    responses.popitem(last=False)
+    response.set_etag(cached[2])
+    return response.make_conditional(request)
+
+
+def invalidate(cls, obj_id):
+    """Drop the cached response of the cls object of id obj_id"""
+    with responses_lock:
+        responses.pop((cls.__name__, obj_id), None)
@@ -4,6 +4,8 @@
 from models import storage
 from flask import Flask, jsonify, request, abort
 from api.v1.views import app_views
+from api.v1.views.cache import cached_response, invalidate
+from api.v1.views.pagination import paginate
 from models.base_model import BaseModel
 from models.state import State
 from models.city import City
@@ -12,27 +14,18 @@ from models.city import City
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
 def get_all_cities(state_id):
-    """Retrieve all cities of the state linked to a given state id.
+    """Retrieve a page of the cities of the state linked to a given state id.
     Raise 404 error otherwise"""
     if storage.get(State, state_id) is None:
         abort(404)
-    city_dict = storage.all(City)
-    city_list = []
-    for city in city_dict.values():
-        if city.state_id == state_id:
-            city = city.to_dict()
-            city_list.append(city)
-    return jsonify(city_list)
+    return paginate(City, {'state_id': state_id})
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'],
                  strict_slashes=False)
 def get_city(city_id):
     """Retrieve City object linked to a given id. Raise 404 otherwise."""
-    city_obj = storage.get(City, city_id)
-    if city_obj is None:
-        abort(404)
-    return jsonify(city_obj.to_dict())
+    return cached_response(City, city_id)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'],
@@ -46,6 +39,7 @@ def delete_city(city_id):
         abort(404)
     storage.delete(city_obj)
     storage.save()
+    invalidate(City, city_id)
     return jsonify({}), 200
 
 
@@ -69,6 +63,7 @@ def add_city(state_id):
         obj.state_id = state_id
         storage.new(obj)
         storage.save()
+        invalidate(City, obj.id)
         city_obj = obj.to_dict()
         return jsonify(city_obj), 201
     abort(404)
@@ -89,4 +84,5 @@ def update_city(city_id):
         if k not in ['id', 'created_at', 'updated_at']:
             setattr(obj, k, v)
     obj.save()
+    invalidate(City, city_id)
     return jsonify(obj.to_dict()), 200
@@ -7,13 +7,15 @@ Routes:
 from flask import jsonify
 from api.v1.views import app_views
 from models import storage
-from models.amenity import Amenity
-from models.base_model import BaseModel
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
+from os import getenv
+import time
+
+stats_names = {"amenities": "Amenity", "cities": "City",
+               "places": "Place", "reviews": "Review",
+               "states": "State", "users": "User"}
+# seconds the /stats totals are reused for, 0 to count on every request
+stats_ttl = float(getenv('HBNB_API_STATS_TTL', 0))
+stats_cache = {"expires": 0, "stats": None}
 
 
 @app_views.route('/status')
@@ -25,12 +27,12 @@ def return_status():
 @app_views.route('/stats')
 def return_stats():
     """Retrieve the amount of objects from each type."""
-    classes = {"amenities": Amenity, "cities": City,
-               "places": Place, "reviews": Review,
-               "states": State, "users": User}
-
-    stats = {}
-    for name, clss in classes.items():
-        total = storage.count(clss)
-        stats[name] = total
+    now = time.monotonic()
+    stats = stats_cache["stats"]
+    if stats is None or now >= stats_cache["expires"]:
+        totals = storage.counts()
+        stats = {name: totals[clss] for name, clss in stats_names.items()}
+        if stats_ttl > 0:
+            stats_cache["stats"] = stats
+            stats_cache["expires"] = now + stats_ttl
     return jsonify(stats)
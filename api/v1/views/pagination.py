@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Keyset pagination of the list routes.
+Query parameters:
+    limit - number of objects per page, HBNB_API_PAGE_LIMIT by default
+            and at most HBNB_API_PAGE_MAX
+    after - id of the last object of the previous page
+The next page is given in a Link header with rel="next". The JSON array
+is streamed as objects are read from storage, so large pages do not
+have to fit in memory.
+"""
+from flask import Response, abort, request, stream_with_context
+import json
+from models import storage
+from os import getenv
+from urllib.parse import urlencode
+
+page_limit = int(getenv('HBNB_API_PAGE_LIMIT', 100))
+page_max = int(getenv('HBNB_API_PAGE_MAX', 1000))
+
+
+def page_args():
+    """Return the limit and after query parameters of the request.
+    Raise 400 error if limit is not a positive number."""
+    limit = request.args.get('limit', page_limit)
+    try:
+        limit = int(limit)
+    except ValueError:
+        abort(400, {'message': 'Invalid limit'})
+    if limit < 1:
+        abort(400, {'message': 'Invalid limit'})
+    return min(limit, page_max), request.args.get('after')
+
+
+def paginate(cls, filters=None):
+    """Return the page of cls objects asked for by the request, as a
+    streamed list of dictionaries, with a Link to the next page if there
+    may be one."""
+    limit, after = page_args()
+    until = storage.cursor(cls, after, limit, filters)
+
+    def generate():
+        """Yield the JSON array of the page, one object at a time"""
+        yield '['
+        separator = ''
+        for obj in storage.stream(cls, after, filters, until):
+            yield separator + json.dumps(obj.to_dict())
+            separator = ', '
+        yield ']\n'
+
+    response = Response(stream_with_context(generate()),
+                        mimetype='application/json')
+    if until is not None:
+        query = urlencode({'limit': limit, 'after': until})
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, query)
+    return response
@@ -4,6 +4,8 @@
 from models import storage
 from flask import Flask, jsonify, request, abort
 from api.v1.views import app_views
+from api.v1.views.cache import cached_response, invalidate
+from api.v1.views.pagination import paginate
 from models.base_model import BaseModel
 from models.state import State
 from models.city import City
@@ -14,27 +16,18 @@ from models.user import User
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
 def get_all_places(city_id):
-    """Retrieve all Places of the city linked to a given city_id.
+    """Retrieve a page of the Places of the city linked to a given city_id.
     Raise 404 error otherwise"""
     if storage.get(City, city_id) is None:
         abort(404)
-    place_dict = storage.all(Place)
-    place_list = []
-    for place in place_dict.values():
-        if place.city_id == city_id:
-            place = place.to_dict()
-            place_list.append(place)
-    return jsonify(place_list)
+    return paginate(Place, {'city_id': city_id})
 
 
 @app_views.route('/places/<place_id>', methods=['GET'],
                  strict_slashes=False)
 def get_place(place_id):
     """Retrieve Place object linked to a given id. Raise 404 otherwise."""
-    place_obj = storage.get(Place, place_id)
-    if place_obj is None:
-        abort(404)
-    return jsonify(place_obj.to_dict())
+    return cached_response(Place, place_id)
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'],
@@ -48,6 +41,7 @@ def delete_place(place_id):
         abort(404)
     storage.delete(obj)
     storage.save()
+    invalidate(Place, place_id)
     return jsonify({}), 200
 
 
@@ -80,6 +74,7 @@ def add_place(city_id):
             obj.city_id = city_id
             storage.new(obj)
             storage.save()
+            invalidate(Place, obj.id)
             return jsonify(obj.to_dict()), 201
     abort(404)
 
@@ -102,4 +97,5 @@ def update_place(place_id):
                      'created_at', 'updated_at']:
             setattr(obj, k, v)
     obj.save()
+    invalidate(Place, place_id)
     return jsonify(obj.to_dict()), 200
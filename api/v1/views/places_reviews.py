@@ -4,6 +4,8 @@
 from models import storage
 from flask import Flask, jsonify, request, abort
 from api.v1.views import app_views
+from api.v1.views.cache import cached_response, invalidate
+from api.v1.views.pagination import paginate
 from models.base_model import BaseModel
 from models.state import State
 from models.city import City
@@ -15,27 +17,18 @@ from models.review import Review
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
 def get_all_reviews(place_id):
-    """Retrieve all reviews of the place linked to a given place_id.
+    """Retrieve a page of the reviews of the place linked to a given place_id.
     Raise 404 error otherwise"""
     if storage.get(Place, place_id) is None:
         abort(404)
-    review_dict = storage.all(Review)
-    review_list = []
-    for rev in review_dict.values():
-        if rev.place_id == place_id:
-            rev = rev.to_dict()
-            review_list.append(rev)
-    return jsonify(review_list)
+    return paginate(Review, {'place_id': place_id})
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'],
                  strict_slashes=False)
 def get_review(review_id):
     """Retrieve Review object linked to a given id. Raise 404 otherwise."""
-    obj = storage.get(Review, review_id)
-    if obj is None:
-        abort(404)
-    return jsonify(obj.to_dict())
+    return cached_response(Review, review_id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
@@ -49,6 +42,7 @@ def delete_review(review_id):
         abort(404)
     storage.delete(obj)
     storage.save()
+    invalidate(Review, review_id)
     return jsonify({}), 200
 
 
@@ -81,6 +75,7 @@ def add_review(place_id):
             obj.place_id = place_id
             storage.new(obj)
             storage.save()
+            invalidate(Review, obj.id)
             return jsonify(obj.to_dict()), 201
     abort(404)
 
@@ -103,4 +98,5 @@ def update_review(review_id):
                      'created_at', 'updated_at']:
             setattr(obj, k, v)
     obj.save()
+    invalidate(Review, review_id)
     return jsonify(obj.to_dict()), 200
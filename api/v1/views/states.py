@@ -4,20 +4,16 @@
 from models import storage
 from flask import Flask, jsonify, request, abort
 from api.v1.views import app_views
+from api.v1.views.cache import cached_response, invalidate
+from api.v1.views.pagination import paginate
 from models.base_model import BaseModel
 from models.state import State
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
 def ret_all_states():
-    """Retrieve a list of all state object dictionaries"""
-    all_states = []
-    states_dict = storage.all(State)
-    if states_dict is None:
-        abort(404)
-    for obj in states_dict.values():
-        all_states.append(obj.to_dict())
-    return jsonify(all_states)
+    """Retrieve a page of the list of all state object dictionaries"""
+    return paginate(State)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -25,10 +21,7 @@ def ret_state(state_id):
     """Retrieve a specific state dictionary.
     Raise 404 error if state_id is not linked to a State object.
     """
-    obj = storage.get(State, state_id)
-    if obj is None:
-        abort(404)
-    return jsonify(obj.to_dict())
+    return cached_response(State, state_id)
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'],
@@ -43,6 +36,7 @@ def delete_state(state_id):
         abort(404)
     storage.delete(obj)
     storage.save()
+    invalidate(State, state_id)
     return jsonify({}), 200
 
 
@@ -62,6 +56,7 @@ def add_state():
         obj = State(**user_input)
         storage.new(obj)
         storage.save()
+        invalidate(State, obj.id)
         state_obj = obj.to_dict()
         return jsonify(state_obj), 201
     abort(404)
@@ -82,4 +77,5 @@ def update_state(state_id):
         if k not in ['id', 'created_at', 'updated_at']:
             setattr(obj, k, v)
     obj.save()
+    invalidate(State, state_id)
     return jsonify(obj.to_dict()), 200
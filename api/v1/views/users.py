@@ -4,17 +4,16 @@
 from models import storage
 from flask import Flask, jsonify, request, abort
 from api.v1.views import app_views
+from api.v1.views.cache import cached_response, invalidate
+from api.v1.views.pagination import paginate
 from models.base_model import BaseModel
 from models.amenity import Amenity
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
 def ret_all_ams():
-    """Retrieve a list of all Amenity object dictionaries"""
-    all_ams = []
-    for obj in storage.all(Amenity).values():
-        all_ams.append(obj.to_dict())
-    return jsonify(all_ams)
+    """Retrieve a page of the list of all Amenity object dictionaries"""
+    return paginate(Amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'],
@@ -23,10 +22,7 @@ def ret_am(amenity_id):
     """Retrieve a specific amenity dictionary.
     Raise 404 error if amenity_id is not linked to an Amenity object.
     """
-    obj = storage.get(Amenity, amenity_id)
-    if obj is None:
-        abort(404)
-    return jsonify(obj.to_dict())
+    return cached_response(Amenity, amenity_id)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'],
@@ -41,6 +37,7 @@ def delete_amenity(amenity_id):
         abort(404)
     storage.delete(obj)
     storage.save()
+    invalidate(Amenity, amenity_id)
     return jsonify({}), 200
 
 
@@ -60,6 +57,7 @@ def add_amenity():
         obj = Amenity(**user_input)
         storage.new(obj)
         storage.save()
+        invalidate(Amenity, obj.id)
         state_obj = obj.to_dict()
         return jsonify(state_obj), 201
     abort(404)
@@ -80,4 +78,5 @@ def update_amenity(amenity_id):
         if k not in ['id', 'created_at', 'updated_at']:
             setattr(obj, k, v)
     obj.save()
+    invalidate(Amenity, amenity_id)
     return jsonify(obj.to_dict()), 200
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Benchmark the binary snapshot format of FileStorage against JSON.
+
+Usage: ./benchmarks/bench_binary_format.py [number of objects]
+
+Saves <number of objects> Places and Reviews (default 1000000) with a
+cold FileStorage.save() in both formats, reloads each file into an
+empty storage and prints the times and the file sizes. Scratch files
+are written to the temporary directory.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def run(binary, path, objects):
+    """saves and reloads objects in one format, returns the timings"""
+    FileStorage._FileStorage__binary = binary
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__fragments.clear()
+    FileStorage._FileStorage__objects = dict(objects)
+    storage = FileStorage()
+    start = time.perf_counter()
+    storage.save()
+    saved = time.perf_counter() - start
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    storage.reload()
+    loaded = time.perf_counter() - start
+    assert storage.count() == len(objects)
+    size = os.path.getsize(path)
+    os.remove(path)
+    return saved, loaded, size
+
+
+def main(total):
+    """builds the objects and prints the comparison"""
+    objects = {}
+    for i in range(total):
+        if i % 2:
+            obj = Review(place_id="p", user_id="u", text="great stay " * 8)
+        else:
+            obj = Place(city_id="c", user_id="u", name="Loft",
+                        description="quiet " * 20, number_rooms=2,
+                        price_by_night=120, latitude=37.77,
+                        longitude=-122.41)
+        objects[obj.__class__.__name__ + "." + obj.id] = obj
+    tmp = tempfile.gettempdir()
+    print("{} objects".format(total))
+    print("{:<8}{:>10}{:>10}{:>12}".format("format", "save", "reload",
+                                           "size"))
+    for name, binary in [("json", False), ("binary", True)]:
+        path = os.path.join(tmp, "bench_file_storage." + name)
+        saved, loaded, size = run(binary, path, objects)
+        print("{:<8}{:>9.2f}s{:>9.2f}s{:>9.1f} MB".format(
+            name, saved, loaded, size / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Benchmark FileStorage.all(cls) and count(cls) against a full scan.
+
+Usage: ./benchmarks/bench_class_index.py [number of objects]
+
+Fills the storage with <number of objects> Reviews (default 1000000)
+plus 50 States and times the per-class lookups the /stats endpoint
+and the list routes depend on. Nothing is written to file.json.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from models.engine.file_storage import FileStorage  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def scan_all(objects, cls):
+    """the linear scan all(cls) used to do"""
+    return {k: v for k, v in objects.items() if v.__class__ is cls}
+
+
+def main(total):
+    """fills the storage and prints the timings"""
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    for i in range(total):
+        storage.new(Review(id="r-{}".format(i)))
+    for i in range(50):
+        storage.new(State(id="s-{}".format(i), name="state"))
+    objects = storage.all()
+    runs = 20
+    rows = [
+        ("scan all(State)", lambda: scan_all(objects, State)),
+        ("all(State)", lambda: storage.all(State)),
+        ("scan count(State)", lambda: len(scan_all(objects, State))),
+        ("count(State)", lambda: storage.count(State)),
+    ]
+    print("{} objects, best of 3 x {} calls".format(len(objects), runs))
+    for name, func in rows:
+        best = min(timeit.repeat(func, number=runs, repeat=3)) / runs
+        print("{:<20}{:>12.1f} us".format(name, best * 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""
+Benchmark the parsing and formatting of created_at and updated_at.
+
+Usage: ./benchmarks/bench_datetime.py [number of cycles]
+
+Runs <number of cycles> (default 1000000) reload/save cycles of one
+timestamp: parse the string stored in the file, then format the
+datetime back, once with strptime/strftime the way BaseModel used to
+and once with base_model.parse_time/format_time. Prints the time of
+each.
+"""
+
+from datetime import datetime
+import os
+import sys
+import time as clock
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+
+
+def main(total):
+    """times both ways of parsing and formatting"""
+    from models.base_model import format_time, parse_time, time
+    values = [datetime(2017, 3, 25, 2, 17, 6, i % 1000000).strftime(time)
+              for i in range(1000)]
+
+    def strptime(value):
+        """parses value the old way"""
+        return datetime.strptime(value, time)
+
+    def strftime(value):
+        """formats value the old way"""
+        return value.strftime(time)
+
+    for name, parse, fmt in [("strptime", strptime, strftime),
+                             ("fromisoformat", parse_time, format_time)]:
+        start = clock.perf_counter()
+        for i in range(total // len(values)):
+            for value in values:
+                assert fmt(parse(value)) == value
+        elapsed = clock.perf_counter() - start
+        print("{:<14}{:>10} cycles {:>8.2f} s".format(name, total, elapsed))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Benchmark the memory taken by file mode model instances.
+
+Usage: ./benchmarks/bench_model_memory.py [number of objects]
+
+Builds <number of objects> (default 20000) Places, Reviews and Users
+from their JSON text, the way FileStorage.reload() does, in a fresh
+process with and without HBNB_FILE_COMPACT=1, and prints the bytes
+allocated per object, attribute values included.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+import uuid
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+
+fields = {
+    "Place": {"name": "Loft", "description": "A quiet loft near the park",
+              "number_rooms": 2, "number_bathrooms": 1, "max_guest": 4,
+              "price_by_night": 120, "latitude": 37.77,
+              "longitude": -122.41},
+    "Review": {"text": "Great stay, we would come again"},
+    "User": {"email": "ann@example.com", "password": "pwd",
+             "first_name": "Ann", "last_name": "Lee"},
+}
+parents = {"Place": ("city_id", "user_id"),
+           "Review": ("place_id", "user_id"), "User": ()}
+
+
+def texts(name, total):
+    """returns the JSON text of total objects of the class name, children
+    of 100 parents"""
+    ids = [str(uuid.uuid4()) for i in range(100)]
+    out = []
+    for i in range(total):
+        attrs = {"id": str(uuid.uuid4()),
+                 "created_at": "2017-03-25T02:17:06.000000",
+                 "updated_at": "2017-03-25T02:17:06.000000",
+                 "__class__": name}
+        attrs.update(fields[name])
+        for attr in parents[name]:
+            attrs[attr] = ids[i % len(ids)]
+        out.append(json.dumps(attrs))
+    return out
+
+
+def measure(total):
+    """prints the bytes per object of each class in this process"""
+    from models.engine.file_storage import classes
+    for name in fields:
+        lines = texts(name, total)
+        tracemalloc.start()
+        objs = [classes[name](**json.loads(line)) for line in lines]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print("{:<8}{:<8}{:>8.0f} bytes/object".format(
+            os.environ.get("HBNB_FILE_COMPACT", "0"), name,
+            size / total - sys.getsizeof(objs) / total))
+        del objs
+
+
+def main(total):
+    """measures each mode in a child process"""
+    for compact in ["0", "1"]:
+        env = dict(os.environ, HBNB_FILE_COMPACT=compact)
+        env.pop("HBNB_TYPE_STORAGE", None)
+        subprocess.run([sys.executable, __file__, "--measure", str(total)],
+                       env=env, check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        measure(int(sys.argv[2]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
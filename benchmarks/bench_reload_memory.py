@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Benchmark the peak memory of FileStorage.reload.
+
+Usage: ./benchmarks/bench_reload_memory.py [number of objects]
+
+Writes <number of objects> Places (default 1000000) to a scratch JSON
+file, then loads it in a fresh process twice: once the way reload()
+used to (json.load of the whole file, then one instance per entry) and
+once with FileStorage.reload(), which streams the file. Prints the
+time and the peak RSS of each process.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+
+
+def load(mode, path):
+    """loads path in this process and prints the time and peak RSS"""
+    from models.engine.file_storage import FileStorage, classes
+    FileStorage._FileStorage__file_path = path
+    storage = FileStorage()
+    start = time.perf_counter()
+    if mode == "json.load":
+        with open(path, 'r') as f:
+            jo = json.load(f)
+        for key in jo:
+            storage.new(classes[jo[key]["__class__"]](**jo[key]))
+        del jo
+    else:
+        storage.reload()
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print("{:<12}{:>10} objects {:>8.2f} s {:>8.0f} MB peak RSS".format(
+        mode, storage.count(), elapsed, peak / 1024))
+
+
+def main(total):
+    """writes the scratch file and loads it in two child processes"""
+    from models.place import Place
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, 'w') as f:
+        f.write("{")
+        for i in range(total):
+            place = Place(name="place", description="x" * 200,
+                          city_id="c", user_id="u", number_rooms=i)
+            f.write("{}{}: {}".format(", " if i else "",
+                                      json.dumps("Place." + place.id),
+                                      json.dumps(place.to_dict())))
+        f.write("}")
+    print("{}: {:.0f} MB".format(path, os.path.getsize(path) / 2 ** 20))
+    try:
+        for mode in ["json.load", "stream"]:
+            subprocess.run([sys.executable, __file__, "--load", mode, path],
+                           cwd=tempfile.gettempdir(), check=True)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--load":
+        load(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
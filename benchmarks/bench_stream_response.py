@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Benchmark the memory used to serve a large /api/v1 list page.
+
+Usage: ./benchmarks/bench_stream_response.py [number of objects]
+
+Stores <number of objects> States (default 100000) in a scratch
+FileStorage, then serves GET /api/v1/states?limit=<number of objects>
+twice: once the way the route used to (a list of to_dict() results
+passed to jsonify) and once through the streamed route. Prints the time
+and the peak memory allocated while serving each response.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+os.environ['HBNB_API_PAGE_MAX'] = sys.argv[1] if len(sys.argv) > 1 \
+    else "100000"
+
+
+def measure(name, serve):
+    """prints the time and the peak memory allocated by serve(), timed
+    on a first run and traced on a second one"""
+    start = time.perf_counter()
+    size = serve()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    serve()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:10} {:8.2f} s {:8.1f} MB peak, {:.1f} MB sent".format(
+        name, elapsed, peak / 2 ** 20, size / 2 ** 20))
+
+
+def main():
+    """serves the same page both ways"""
+    from flask import jsonify
+    from models.engine.file_storage import FileStorage
+    from models.state import State
+    from api.v1.app import app
+    import models
+
+    count = int(os.environ['HBNB_API_PAGE_MAX'])
+    FileStorage._FileStorage__file_path = os.path.join(
+        tempfile.mkdtemp(), "file.json")
+    for i in range(count):
+        models.storage.new(State(name="State {}".format(i)))
+    client = app.test_client()
+
+    def jsonify_list():
+        """the former route: one list, then one JSON string"""
+        with app.test_request_context():
+            states = [obj.to_dict()
+                      for obj in models.storage.page(State, limit=count)]
+            return len(jsonify(states).get_data())
+
+    def streamed():
+        """the current route, consuming the body chunk by chunk"""
+        response = client.get("/api/v1/states?limit={}".format(count),
+                              buffered=False)
+        size = sum(len(chunk) for chunk in response.response)
+        response.close()
+        return size
+
+    measure("jsonify", jsonify_list)
+    measure("streamed", streamed)
+
+
+if __name__ == "__main__":
+    main()
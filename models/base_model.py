@@ -6,51 +6,199 @@ Contains class BaseModel
 from datetime import datetime
 import models
 from os import getenv
+import os
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
-import uuid
+import sys
+import time as clock
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+compact = models.storage_t != "db" and getenv("HBNB_FILE_COMPACT") == "1"
+
+
+class Slotted(type):
+    """metaclass of the models in compact file mode: the attributes a class
+    gives a default value are kept in slots instead of in the __dict__ of
+    each instance, and the defaults in the _defaults of the class"""
+
+    def __new__(mcs, name, bases, namespace):
+        """moves the default values of namespace out of the class"""
+        defaults = {}
+        for attr, value in list(namespace.items()):
+            if attr[:1] != "_" and not callable(value) and \
+               not isinstance(value, (property, classmethod, staticmethod)):
+                defaults[attr] = namespace.pop(attr)
+        namespace.setdefault("__slots__", tuple(defaults))
+        cls = super().__new__(mcs, name, bases, namespace)
+        cls._defaults = {}
+        cls._slots = ()
+        for base in reversed(cls.__mro__[:-1]):
+            cls._defaults.update(base.__dict__.get("_defaults", {}))
+            cls._slots += tuple(slot for slot in base.__dict__["__slots__"]
+                                if slot[:1] != "_")
+        cls._defaults.update(defaults)
+        return cls
+
+
 if models.storage_t == "db":
     Base = declarative_base()
+    Meta = type
 else:
     Base = object
+    Meta = Slotted if compact else type
+
+
+def parse_time(value):
+    """returns the datetime of value, a string in the format time"""
+    # fromisoformat is much faster than strptime, but accepts more formats
+    if len(value) == 26 and value[10] == "T" and value[19] == ".":
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            if parsed.tzinfo is None:
+                return parsed
+    return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """returns the datetime value as a string in the format time"""
+    if value.tzinfo is None and value.year >= 1000:
+        if value.microsecond:
+            return value.isoformat()
+        return value.isoformat(timespec="microseconds")
+    return value.strftime(time)
+
+
+def uuid4():
+    """returns a random UUID string, twice as fast as str(uuid.uuid4())"""
+    h = os.urandom(16).hex()
+    variant = 8 | int(h[16], 16) & 3
+    return "{}-{}-4{}-{:x}{}-{}".format(h[:8], h[8:12], h[13:16], variant,
+                                        h[17:20], h[20:])
+
 
+def uuid7():
+    """returns a time-ordered UUID string: milliseconds since the epoch
+    then random bits, so that new ids go at the end of an index"""
+    ms = clock.time_ns() // 1000000
+    h = os.urandom(10).hex()
+    variant = 8 | int(h[3], 16) & 3
+    return "{:08x}-{:04x}-7{}-{:x}{}-{}".format(ms >> 16, ms & 0xffff, h[:3],
+                                                variant, h[4:7], h[7:19])
 
-class BaseModel:
+
+id_strategies = {"uuid4": uuid4, "uuid7": uuid7}
+# returns the id of a new instance, any callable returning a unique
+# string can be set here
+new_id = id_strategies.get(getenv("HBNB_ID_STRATEGY"), uuid4)
+
+
+def changes(obj):
+    """returns the number of times an attribute of obj was set or deleted,
+    file mode only"""
+    return getattr(obj, "_BaseModel__changes", 0)
+
+
+def attributes(obj):
+    """returns the attributes set on obj, the __dict__ of obj unless the
+    models are compact"""
+    if not compact:
+        return obj.__dict__
+    attrs = {}
+    for slot in obj._slots:
+        try:
+            attrs[slot] = object.__getattribute__(obj, slot)
+        except AttributeError:
+            pass
+    attrs.update(obj.__dict__)
+    return attrs
+
+
+class BaseModel(metaclass=Meta):
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    elif compact:
+        __slots__ = ("id", "created_at", "updated_at", "__changes",
+                     "__cached", "__dict__", "__weakref__")
+    else:
+        # __changes - counts the attributes set or deleted, __cached -
+        # (__changes, to_dict()) when to_dict() was last built
+        __slots__ = ("__changes", "__cached", "__dict__", "__weakref__")
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
+        if models.storage_t != "db":
+            object.__setattr__(self, "_BaseModel__changes", 0)
+            object.__setattr__(self, "_BaseModel__cached", None)
         if kwargs:
             for key, value in kwargs.items():
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
+                self.created_at = parse_time(kwargs["created_at"])
+            elif type(kwargs.get("created_at", None)) is not datetime:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
+                self.updated_at = parse_time(kwargs["updated_at"])
+            elif type(kwargs.get("updated_at", None)) is not datetime:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
-                self.id = str(uuid.uuid4())
+                self.id = new_id()
         else:
-            self.id = str(uuid.uuid4())
+            self.id = new_id()
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute, counting the change, telling the storage
+            so that its next save writes it, and keeping the storage's
+            foreign key indexes up to date when a <parent>_id attribute
+            changes"""
+            if name[-3:] == "_id":
+                if compact and type(value) is str:
+                    # the same parent id is shared by all its children
+                    value = sys.intern(value)
+                old = getattr(self, name, None)
+                super().__setattr__(name, value)
+                if old != value:
+                    models.storage.reindex(self, name, old)
+            else:
+                super().__setattr__(name, value)
+            # counted once the value is set, so that a to_dict() running
+            # meanwhile does not cache the old value under the new count
+            object.__setattr__(self, "_BaseModel__changes",
+                               changes(self) + 1)
+            models.storage.changed(self)
+
+        def __delattr__(self, name):
+            """deletes an attribute, counting the change and telling the
+            storage"""
+            super().__delattr__(name)
+            object.__setattr__(self, "_BaseModel__changes",
+                               changes(self) + 1)
+            models.storage.changed(self)
+
+    if compact:
+        def __getattr__(self, name):
+            """returns the class default of an attribute not set yet"""
+            try:
+                return self._defaults[name]
+            except KeyError:
+                raise AttributeError("{!r} object has no attribute {!r}"
+                                     .format(type(self).__name__, name))
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
-                                         self.__dict__)
+                                         attributes(self))
 
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
@@ -60,14 +208,25 @@ class BaseModel:
 
     def to_dict(self):
         """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
+        if models.storage_t != "db":
+            # SQLAlchemy loads attributes without __setattr__, file mode
+            # objects are only changed through it
+            count = changes(self)
+            cached = getattr(self, "_BaseModel__cached", None)
+            if cached is not None and cached[0] == count:
+                return cached[1].copy()
+        new_dict = dict(attributes(self))
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+        if models.storage_t != "db" and changes(self) == count:
+            # not changed while it was built
+            object.__setattr__(self, "_BaseModel__cached",
+                               (count, new_dict.copy()))
         return new_dict
 
     def delete(self):
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Reads and writes the binary snapshot format of FileStorage
+
+Usage: python3 -m models.engine.binary_format <file.json> <file.hbnb>
+converts a JSON file written by FileStorage to the binary format.
+
+The file starts with MAGIC, followed by blocks of up to BLOCK_SIZE
+objects of a single class. Each block is a little-endian 4-byte length
+then a marshal of (class name, field names, rows): one list of values
+per object, in the order of the field names, with Ellipsis for the
+fields an object does not have. created_at and updated_at are stored
+as microseconds since the epoch instead of strings.
+"""
+
+from datetime import datetime, timedelta
+import marshal
+import struct
+import sys
+
+MAGIC = b"HBNB\x00\x01"
+BLOCK_SIZE = 10000
+# marshal format version, stable across python 3 releases
+VERSION = 4
+dates = ("created_at", "updated_at")
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+_header = struct.Struct("<I")
+
+
+def dump(records, f):
+    """writes the (class name, attribute dict) pairs of records to the
+    binary file f"""
+    by_class = {}
+    for name, attrs in records:
+        block = by_class.get(name)
+        if block is None:
+            block = by_class[name] = []
+        block.append(attrs)
+    f.write(MAGIC)
+    for name, objs in by_class.items():
+        for i in range(0, len(objs), BLOCK_SIZE):
+            _dump_block(name, objs[i:i + BLOCK_SIZE], f)
+
+
+def _dump_block(name, objs, f):
+    """writes one block of objects of the class name"""
+    fields = {}
+    for attrs in objs:
+        for field in attrs:
+            fields[field] = None
+    fields.pop("_sa_instance_state", None)
+    fields.pop("__class__", None)
+    fields = tuple(fields)
+    date_columns = [i for i, field in enumerate(fields) if field in dates]
+    rows = []
+    for attrs in objs:
+        row = [attrs.get(field, ...) for field in fields]
+        for i in date_columns:
+            if type(row[i]) is datetime:
+                row[i] = (row[i] - _epoch) // _microsecond
+        rows.append(row)
+    data = marshal.dumps((name, fields, rows), VERSION)
+    f.write(_header.pack(len(data)))
+    f.write(data)
+
+
+def load(f):
+    """yields a (class name, attribute dict) pair for each object in the
+    binary file f"""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a binary FileStorage file")
+    while True:
+        header = f.read(_header.size)
+        if not header:
+            return
+        if len(header) < _header.size:
+            raise ValueError("truncated binary FileStorage file")
+        size, = _header.unpack(header)
+        data = f.read(size)
+        if len(data) < size:
+            raise ValueError("truncated binary FileStorage file")
+        name, fields, rows = marshal.loads(data)
+        date_fields = [field for field in fields if field in dates]
+        for row in rows:
+            attrs = {}
+            for field, value in zip(fields, row):
+                if value is not ...:
+                    attrs[field] = value
+            for field in date_fields:
+                if type(attrs.get(field)) is int:
+                    attrs[field] = _epoch + attrs[field] * _microsecond
+            yield name, attrs
+
+
+def convert(json_path, binary_path):
+    """writes the objects of the JSON file at json_path to binary_path"""
+    from models.base_model import parse_time
+    from models.engine.json_stream import iter_items
+
+    def records(f):
+        """yields the objects of the JSON file f"""
+        for key, attrs in iter_items(f):
+            for field in dates:
+                if type(attrs.get(field)) is str:
+                    attrs[field] = parse_time(attrs[field])
+            yield attrs["__class__"], attrs
+
+    with open(json_path, 'r') as f, open(binary_path, 'wb') as out:
+        dump(records(f), out)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: {} <file.json> <file.hbnb>".format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
@@ -3,6 +3,7 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
@@ -13,17 +14,66 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import create_engine, event, func, inspect, literal, \
+    select, union_all
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.orm import Session, scoped_session, selectinload, \
+    sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+import random
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool"""
+        super().__init__(*args, **kwargs)
+        self.stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        """checks out a connection, timing the wait"""
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            wait = time.monotonic() - start
+            with self.stats_lock:
+                self.checkouts += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+
+
+class RoutingSession(Session):
+    """Session reading from a random replica engine of info["replicas"]
+    until it writes, then only from its primary engine"""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """the engine for the next statement"""
+        replicas = self.info.get("replicas")
+        if not replicas or self._flushing or self.info.get("wrote"):
+            return super().get_bind(mapper, clause, **kwargs)
+        return random.choice(replicas)
+
+
 class DBStorage:
-    """interaacts with the MySQL database"""
+    """interaacts with the MySQL database, or the database of the
+    SQLAlchemy URL HBNB_DB_URL"""
     __engine = None
     __session = None
+    # rows fetched at a time by stream()
+    stream_batch = 500
+    # per thread: the get() results of the current request, by (class,
+    # id), None for an id that does not exist; see begin_scope()
+    __scope = threading.local()
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,61 +82,363 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        url = 'mysql+mysqldb://{}:{}@{}/{}'
+        # a full SQLAlchemy URL, such as sqlite:///hbnb.db, replaces the
+        # HBNB_MYSQL_* settings
+        HBNB_DB_URL = getenv('HBNB_DB_URL')
+        if HBNB_DB_URL is None:
+            HBNB_DB_URL = url.format(HBNB_MYSQL_USER, HBNB_MYSQL_PWD,
+                                     HBNB_MYSQL_HOST, HBNB_MYSQL_DB)
+        self.__engine = self.make_engine(HBNB_DB_URL)
+        # comma separated hosts, or full URLs, of read-only replicas
+        self.__replicas = []
+        for host in getenv('HBNB_MYSQL_REPLICA_HOSTS', "").split(","):
+            host = host.strip()
+            if not host:
+                continue
+            if "://" not in host:
+                host = url.format(HBNB_MYSQL_USER, HBNB_MYSQL_PWD, host,
+                                  HBNB_MYSQL_DB)
+            self.__replicas.append(self.make_engine(host))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    @classmethod
+    def make_engine(cls, url):
+        """create the engine of url, with the pool options and, for
+        SQLite, the pragmas of sqlite_pragmas"""
+        url = make_url(url)
+        if url.get_backend_name() != "sqlite":
+            return create_engine(url, **cls.pool_options())
+        memory = url.database in (None, "", ":memory:")
+        if memory:
+            # every connection would open a database of its own
+            options = {"poolclass": StaticPool}
+        else:
+            options = cls.pool_options()
+        # the pool hands connections to whichever thread needs one
+        options["connect_args"] = {"check_same_thread": False}
+        engine = create_engine(url, **options)
+        pragmas = [(name, value) for name, value in cls.sqlite_pragmas
+                   if not (memory and name == "journal_mode")]
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(connection, record):
+            """tune every new SQLite connection"""
+            cursor = connection.cursor()
+            for name, value in pragmas:
+                cursor.execute("PRAGMA {}={}".format(name, value))
+            cursor.close()
+        return engine
+
+    # set on every SQLite connection: readers do not block the writer,
+    # commits only sync the log, and foreign keys are enforced like in
+    # MySQL
+    sqlite_pragmas = (("journal_mode", "WAL"), ("synchronous", "NORMAL"),
+                      ("foreign_keys", "ON"), ("busy_timeout", 5000),
+                      ("cache_size", -64000), ("temp_store", "MEMORY"),
+                      ("mmap_size", 1 << 28))
+
+    @staticmethod
+    def pool_options():
+        """create_engine() pool arguments read from the environment"""
+        return {
+            "poolclass": TimedQueuePool,
+            "pool_size": int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+            "max_overflow": int(getenv('HBNB_MYSQL_MAX_OVERFLOW', 10)),
+            # seconds, below MySQL's wait_timeout so the server never
+            # closes a connection the pool still holds
+            "pool_recycle": int(getenv('HBNB_MYSQL_POOL_RECYCLE', 3600)),
+            "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING', "1") == "1",
+            "pool_timeout": float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)),
+        }
+
+    def pool_stats(self):
+        """return the size, usage and checkout wait times of the pool,
+        and under "replicas" those of the pool of each replica"""
+        stats = self.__pool_stats(self.__engine.pool)
+        if self.__replicas:
+            stats["replicas"] = [self.__pool_stats(engine.pool)
+                                 for engine in self.__replicas]
+        return stats
+
+    @staticmethod
+    def __pool_stats(pool):
+        """return the size, usage and checkout wait times of pool, or
+        nothing for a pool that is not a queue, like the single
+        connection of an in-memory SQLite database"""
+        if not isinstance(pool, QueuePool):
+            return {}
+        stats = {"size": pool.size(), "checked_in": pool.checkedin(),
+                 "checked_out": pool.checkedout(),
+                 "overflow": pool.overflow()}
+        if isinstance(pool, TimedQueuePool):
+            with pool.stats_lock:
+                stats["checkouts"] = pool.checkouts
+                stats["wait_total"] = pool.wait_total
+                stats["wait_max"] = pool.wait_max
+        return stats
+
+    @staticmethod
+    def load_options(cls, load):
+        """loader options for the relationships of cls named in load.
+        A name loads a relationship with a SELECT ... IN query, a dotted
+        path like "cities.places" loads each step in turn; SQLAlchemy
+        loader options such as joinedload(State.cities) are kept as is."""
+        options = []
+        for path in load or ():
+            if not isinstance(path, str):
+                options.append(path)
+                continue
+            option = None
+            current = cls
+            for name in path.split("."):
+                attr = getattr(current, name)
+                if option is None:
+                    option = selectinload(attr)
+                else:
+                    option = option.selectinload(attr)
+                current = attr.property.mapper.class_
+            options.append(option)
+        return options
+
+    def all(self, cls=None, load=None):
+        """query on the current database session. load names the
+        relationships of cls to load along, see load_options"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
-                    key = obj.__class__.__name__ + '.' + obj.id
-                    new_dict[key] = obj
+                query = self.__session.query(classes[clss])
+                if load and cls is not None:
+                    query = query.options(
+                        *self.load_options(classes[clss], load))
+                prefix = clss + '.'
+                for obj in query.all():
+                    new_dict[prefix + obj.id] = obj
         return (new_dict)
 
+    def children(self, parent_cls, parent_id, child_cls):
+        """query the child_cls rows whose <parent>_id is parent_id"""
+        if type(parent_cls) is str:
+            parent_cls = classes.get(parent_cls)
+        if type(child_cls) is str:
+            child_cls = classes.get(child_cls)
+        new_dict = {}
+        if parent_cls is None or child_cls is None:
+            return new_dict
+        column = getattr(child_cls, parent_cls.__name__.lower() + "_id", None)
+        if column is None:
+            return new_dict
+        objs = self.__session.query(child_cls).filter(column == parent_id)
+        prefix = child_cls.__name__ + '.'
+        for obj in objs:
+            new_dict[prefix + obj.id] = obj
+        return new_dict
+
+    def __keyset(self, query, cls, after_id, filters):
+        """filter query on filters and on ids after after_id"""
+        if filters:
+            query = query.filter_by(**filters)
+        if after_id is not None:
+            query = query.filter(cls.id > after_id)
+        return query.order_by(cls.id)
+
+    def page(self, cls, after_id=None, limit=100, filters=None):
+        """query up to limit cls rows ordered by id, starting after
+        after_id, whose columns equal the values of filters"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls)
+        return self.__keyset(query, cls, after_id, filters).limit(limit).all()
+
+    def cursor(self, cls, after_id=None, limit=100, filters=None):
+        """query the id of the last row page() would return, None if it
+        would return less than limit rows"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return None
+        query = self.__session.query(cls.id)
+        query = self.__keyset(query, cls, after_id, filters)
+        return query.offset(limit - 1).limit(1).scalar()
+
+    def stream(self, cls, after_id=None, filters=None, until_id=None):
+        """query the cls rows ordered by id, starting after after_id and
+        up to until_id, whose columns equal the values of filters,
+        fetching them from a server-side cursor in batches"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return iter(())
+        query = self.__session.query(cls)
+        query = self.__keyset(query, cls, after_id, filters)
+        if until_id is not None:
+            query = query.filter(cls.id <= until_id)
+        return query.yield_per(self.stream_batch)
+
     def new(self, obj):
         """add the object to the current database session"""
+        self.__write()
         self.__session.add(obj)
+        self.__cache_put(obj.__class__, obj.id, obj)
+
+    def bulk_new(self, objs):
+        """insert every object of objs with one executemany per table
+        and commit them"""
+        objs = list(objs)
+        self.__write()
+        self.__session.bulk_save_objects(objs)
+        self.__session.commit()
+        for obj in objs:
+            self.__cache_put(obj.__class__, obj.id, obj)
+        return objs
+
+    def bulk_update(self, cls, rows):
+        """update the cls rows with the values of rows, dictionaries
+        holding the id of the row to update, with one executemany and
+        commit them. Ids that are not in the table are skipped. Objects
+        already loaded in the session keep their old values."""
+        rows = list(rows)
+        self.__write()
+        ids = [row["id"] for row in rows]
+        found = set(id for id, in self.__session.query(cls.id).
+                    filter(cls.id.in_(ids)))
+        now = datetime.utcnow()
+        mappings = []
+        for row in rows:
+            if row["id"] not in found:
+                continue
+            mapping = {key: value for key, value in row.items()
+                       if key not in ("created_at", "updated_at",
+                                      "__class__")}
+            mapping["updated_at"] = now
+            mappings.append(mapping)
+            self.__cache_pop(cls, row["id"])
+        self.__session.bulk_update_mappings(cls, mappings)
+        self.__session.commit()
 
     def save(self):
         """commit all changes of the current database session"""
+        self.__write()
         self.__session.commit()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
+            self.__write()
             self.__session.delete(obj)
+            self.__cache_put(obj.__class__, obj.id, None)
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        self.migrate(self.__engine)
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    class_=RoutingSession,
+                                    info={"replicas": self.__replicas})
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    @staticmethod
+    def migrate(engine):
+        """create the indexes of the models missing from the database of
+        engine, as create_all() skips the tables that already exist, and
+        return their names"""
+        inspector = inspect(engine)
+        tables = set(inspector.get_table_names())
+        created = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            names = set(index["name"]
+                        for index in inspector.get_indexes(table.name))
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                if index.name not in names:
+                    index.create(engine)
+                    created.append(index.name)
+        return created
+
+    def __write(self):
+        """send every statement of the session to the primary from now
+        on, so the request reads what it wrote"""
+        self.__session.info["wrote"] = True
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
+        self.__scope.cache = None
+
+    def begin_scope(self):
+        """remember the objects get() and get_many() find, and the ids
+        they do not, until close(): call it when a request starts"""
+        self.__scope.cache = {}
+
+    def __cache_put(self, cls, id, obj):
+        """record obj, or None if it does not exist, as cls.id"""
+        cache = getattr(self.__scope, "cache", None)
+        if cache is not None:
+            cache[(cls, id)] = obj
 
-    def get(self, cls, id):
-        """ Return object based on class and ID, None otherwise. """
+    def __cache_pop(self, cls, id):
+        """forget what is known of cls.id"""
+        cache = getattr(self.__scope, "cache", None)
+        if cache is not None:
+            cache.pop((cls, id), None)
+
+    def get(self, cls, id, load=None):
+        """ Return object based on class and ID, None otherwise.
+        load names the relationships to load along, see load_options"""
+        if type(cls) is str:
+            cls = classes.get(cls)
         if cls in classes.values():
-            return self.__session.query(cls).get(id)
+            cache = getattr(self.__scope, "cache", None)
+            if cache is not None and not load and (cls, id) in cache:
+                return cache[(cls, id)]
+            query = self.__session.query(cls)
+            if load:
+                query = query.options(*self.load_options(cls, load))
+            obj = query.get(id)
+            self.__cache_put(cls, id, obj)
+            return obj
         return None
 
+    def get_many(self, cls, ids):
+        """ Return {id: object} for the ids of existing cls objects,
+        querying the ones not seen yet with WHERE id IN (...)"""
+        found = {}
+        if cls not in classes.values():
+            return found
+        cache = getattr(self.__scope, "cache", None)
+        missing = []
+        for id in set(ids):
+            if cache is not None and (cls, id) in cache:
+                if cache[(cls, id)] is not None:
+                    found[id] = cache[(cls, id)]
+            else:
+                missing.append(id)
+        for i in range(0, len(missing), self.stream_batch):
+            chunk = missing[i:i + self.stream_batch]
+            for obj in self.__session.query(cls).filter(cls.id.in_(chunk)):
+                found[obj.id] = obj
+        for id in missing:
+            self.__cache_put(cls, id, found.get(id))
+        return found
+
     def count(self, cls=None):
         """ Count all objects of a given class or in general."""
         if cls is not None:
             return self.__session.query(cls).count()
-        else:
-            count = 0
-            for clss in classes:
-                count += self.__session.query(classes[clss]).count()
-            return count
+        return sum(self.counts().values())
+
+    def counts(self):
+        """ Return the number of objects of each class, in one query."""
+        query = union_all(*[select([literal(name).label("name"),
+                                    func.count().label("total")]).
+                            select_from(clss.__table__)
+                            for name, clss in classes.items()])
+        totals = dict.fromkeys(classes, 0)
+        for name, total in self.__session.execute(query):
+            totals[name] = total
+        return totals
@@ -3,87 +3,772 @@
 Contains the FileStorage class
 """
 
+import bisect
+from contextlib import contextmanager
+from datetime import datetime
+import io
+import itertools
 import json
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, attributes, changes
 from models.city import City
+from models.engine import binary_format
+from models.engine.journal import Journal
+from models.engine.json_stream import iter_items, iter_offsets
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import getenv
+import os
+import threading
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# foreign keys kept in reverse indexes, by class name
+fk_indexes = {"Amenity": ("place_id",), "City": ("state_id",),
+              "Place": ("city_id", "user_id"),
+              "Review": ("place_id", "user_id")}
+
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
-    # string - path to the JSON file
-    __file_path = "file.json"
+    # string - path to the JSON file, or to the binary snapshot written by
+    # models/engine/binary_format.py when HBNB_FILE_FORMAT=binary
+    __binary = getenv("HBNB_FILE_FORMAT") == "binary"
+    __file_path = "file.hbnb" if __binary else "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name> -> {<class name>.id: obj}, mirrors __objects
+    __by_class = {}
+    # dictionary - (<class name>, <foreign key>) -> {value: {key: obj}}
+    __by_fk = {}
+    # dictionary - <class name> -> sorted list of the keys of that class,
+    # built objects and lazy ones, built on first use by page()
+    __ordered = {}
+    # dictionary - <class name> -> (keys added, keys removed) since the
+    # sorted list was last brought up to date: inserting in the middle of
+    # a long list on every new() would make bulk imports quadratic
+    __pending = {}
+    # the __objects dictionary the indexes were built from, and its length
+    __indexed = None
+    __indexed_len = 0
+    # dictionary - keys changed since the last save: the object, or None
+    # if it was deleted
+    __dirty = {}
+    # dictionary - key -> (obj, '"<key>": <obj as JSON>', len('"<key>": '),
+    # changes(obj)) as last written, stale once obj changed
+    __fragments = {}
+    # dictionary - <class name> -> {key: (offset, length)} of the objects
+    # in the JSON file that are not built yet. reload only indexes the file
+    # and objects are built on first access when HBNB_FILE_LAZY=1
+    __lazy = {}
+    __lazy_mode = getenv("HBNB_FILE_LAZY") == "1" and not __binary
+    # file - the JSON file the offsets point into, opened in binary
+    __lazy_file = None
+    # Journal - saves append the dirty objects to it instead of rewriting
+    # the whole file when HBNB_FILE_JOURNAL=1; reload always replays it
+    __journal = Journal(__file_path + ".log")
+    __journaled = getenv("HBNB_FILE_JOURNAL") == "1"
+    # int - the log is compacted into the file once it is bigger than
+    # the file and than this many bytes
+    __journal_min = 1 << 20
+    # list - stat of the JSON file and the journal when this process last
+    # loaded or saved them; close() only reloads once they change, and
+    # never when HBNB_FILE_SINGLE_WRITER=1
+    __loaded = None
+    __single_writer = getenv("HBNB_FILE_SINGLE_WRITER") == "1"
+    # Thread - compaction running in the background, if any
+    __compactor = None
+    __lock = threading.Lock()
+
+    def __sync(self):
+        """rebuilds the indexes if __objects was replaced or resized"""
+        if (self.__objects is FileStorage.__indexed and
+                len(self.__objects) == FileStorage.__indexed_len):
+            return
+        self.__by_class.clear()
+        self.__by_fk.clear()
+        self.__ordered.clear()
+        self.__pending.clear()
+        for key, obj in self.__objects.items():
+            self.__index(key, obj)
+        FileStorage.__indexed = self.__objects
+        FileStorage.__indexed_len = len(self.__objects)
+
+    def __index(self, key, obj):
+        """adds obj to the per-class and foreign key indexes"""
+        name = obj.__class__.__name__
+        bucket = self.__by_class.get(name)
+        if bucket is None:
+            bucket = self.__by_class[name] = {}
+        bucket[key] = obj
+        self.__order(name, key, True)
+        for attr in fk_indexes.get(name, ()):
+            self.__index_fk(name, attr, getattr(obj, attr, None), key, obj)
+
+    def __unindex(self, key, obj):
+        """removes obj from the per-class and foreign key indexes"""
+        name = obj.__class__.__name__
+        bucket = self.__by_class.get(name)
+        if bucket is not None:
+            bucket.pop(key, None)
+        self.__order(name, key, False)
+        for attr in fk_indexes.get(name, ()):
+            self.__unindex_fk(name, attr, getattr(obj, attr, None), key)
+
+    def __order(self, name, key, present):
+        """records that key was added to or removed from the ordered keys
+        of the class name, if they were built"""
+        keys = self.__ordered.get(name)
+        if keys is None:
+            return
+        pending = self.__pending.get(name)
+        if pending is None:
+            pending = self.__pending[name] = (set(), set())
+        added, removed = pending
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if present:
+                removed.discard(key)
+            else:
+                removed.add(key)
+        elif present:
+            added.add(key)
+        else:
+            added.discard(key)
+
+    def __ordered_keys(self, name):
+        """returns the sorted keys of the objects of the class name"""
+        self.__sync()
+        keys = self.__ordered.get(name)
+        if keys is None:
+            keys = list(self.__by_class.get(name, ()))
+            keys.extend(self.__lazy.get(name, ()))
+            keys.sort()
+            self.__ordered[name] = keys
+            return keys
+        pending = self.__pending.pop(name, None)
+        if pending is not None:
+            added, removed = pending
+            if len(removed) > 64:
+                keys[:] = [key for key in keys if key not in removed]
+            else:
+                for key in removed:
+                    del keys[bisect.bisect_left(keys, key)]
+            if added:
+                # two sorted runs: sort() merges them in linear time
+                keys.extend(sorted(added))
+                keys.sort()
+        return keys
+
+    def __index_fk(self, name, attr, value, key, obj):
+        """adds obj to the reverse index of <name>.<attr> under value"""
+        if type(value) is not str:
+            return
+        index = self.__by_fk.get((name, attr))
+        if index is None:
+            index = self.__by_fk[(name, attr)] = {}
+        bucket = index.get(value)
+        if bucket is None:
+            bucket = index[value] = {}
+        bucket[key] = obj
+
+    def __unindex_fk(self, name, attr, value, key):
+        """removes key from the reverse index of <name>.<attr> under value"""
+        bucket = self.__by_fk.get((name, attr), {}).get(value)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self.__by_fk[(name, attr)][value]
+
+    def __hydrate(self, name=None, key=None):
+        """builds the objects of the JSON file that are not built yet: all
+        of them, those of the class name, or only the one stored at key"""
+        lazy = self.__lazy
+        if not lazy:
+            return
+        if key is not None:
+            bucket = lazy.get(key.partition(".")[0])
+            if bucket is None or key not in bucket:
+                return
+            entries = [(key, bucket.pop(key))]
+        elif name is not None:
+            entries = list(lazy.pop(name, {}).items())
+        else:
+            entries = [entry for bucket in lazy.values()
+                       for entry in bucket.items()]
+            lazy.clear()
+        for key, raw in self.__read(entries):
+            value = json.loads(raw)
+            self.__put(key, classes[value["__class__"]](**value))
+
+    def __read(self, entries):
+        """returns (key, JSON text) for the (key, (offset, length)) entries
+        read from the JSON file"""
+        f = FileStorage.__lazy_file
+        raws = []
+        with self.__lock:
+            for key, (offset, length) in sorted(entries,
+                                                key=lambda e: e[1][0]):
+                f.seek(offset)
+                raws.append((key, f.read(length).decode("utf-8")))
+        return raws
+
+    def __lazy_entries(self):
+        """returns the (key, (offset, length)) entries not built yet"""
+        return [entry for bucket in self.__lazy.values()
+                for entry in bucket.items()]
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects. load is accepted for
+        DBStorage compatibility: relationships are read from the indexes"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            self.__sync()
+            if type(cls) is not str:
+                cls = cls.__name__
+            self.__hydrate(cls)
+            return dict(self.__by_class.get(cls, {}))
+        self.__hydrate()
         return self.__objects
 
+    def children(self, parent_cls, parent_id, child_cls):
+        """returns the child_cls objects whose <parent>_id is parent_id"""
+        self.__sync()
+        if type(parent_cls) is not str:
+            parent_cls = parent_cls.__name__
+        if type(child_cls) is not str:
+            child_cls = child_cls.__name__
+        self.__hydrate(child_cls)
+        attr = parent_cls.lower() + "_id"
+        if attr in fk_indexes.get(child_cls, ()):
+            objs = self.__by_fk.get((child_cls, attr), {}).get(parent_id, {})
+        else:
+            objs = self.__by_class.get(child_cls, {})
+        new_dict = {}
+        for key, obj in objs.items():
+            if getattr(obj, attr, None) == parent_id:
+                new_dict[key] = obj
+        return new_dict
+
+    def page(self, cls, after_id=None, limit=100, filters=None):
+        """returns up to limit cls objects ordered by id, starting after
+        after_id, whose attributes equal the values of filters"""
+        return list(itertools.islice(self.stream(cls, after_id, filters),
+                                     limit))
+
+    def cursor(self, cls, after_id=None, limit=100, filters=None):
+        """returns the id of the last object page() would return, or None
+        if it would return less than limit objects"""
+        for i, obj in enumerate(self.stream(cls, after_id, filters), 1):
+            if i == limit:
+                return obj.id
+        return None
+
+    def stream(self, cls, after_id=None, filters=None, until_id=None):
+        """yields the cls objects ordered by id, starting after after_id
+        and up to until_id, whose attributes equal the values of filters.
+        Objects are only built as they are reached."""
+        self.__sync()
+        if type(cls) is not str:
+            cls = cls.__name__
+        filters = filters or {}
+        attrs = [attr for attr in filters if attr in fk_indexes.get(cls, ())]
+        if attrs:
+            self.__hydrate(cls)
+            keys = sorted(self.__by_fk.get((cls, attrs[0]), {}).get(
+                filters[attrs[0]], ()))
+        key = None if after_id is None else cls + "." + after_id
+        last = None if until_id is None else cls + "." + until_id
+        while True:
+            if not attrs:
+                # looked up again as objects may come and go between yields
+                keys = self.__ordered_keys(cls)
+            i = 0 if key is None else bisect.bisect_right(keys, key)
+            if i == len(keys) or (last is not None and keys[i] > last):
+                return
+            key = keys[i]
+            self.__hydrate(key=key)
+            obj = self.__objects.get(key)
+            if obj is None:
+                continue
+            for attr, value in filters.items():
+                if getattr(obj, attr, None) != value:
+                    break
+            else:
+                yield obj
+
+    def reindex(self, obj, attr, old):
+        """moves obj in the foreign key indexes after obj.<attr> changed"""
+        name = obj.__class__.__name__
+        if attr not in fk_indexes.get(name, ()) or \
+           getattr(obj, "id", None) is None:
+            return
+        key = name + "." + obj.id
+        if self.__objects.get(key) is not obj:
+            return
+        self.__sync()
+        self.__unindex_fk(name, attr, old, key)
+        self.__index_fk(name, attr, getattr(obj, attr, None), key, obj)
+
+    def changed(self, obj):
+        """marks obj dirty after one of its attributes was set or deleted,
+        if it is the object stored under its key"""
+        if getattr(obj, "id", None) is None:
+            return
+        key = obj.__class__.__name__ + "." + obj.id
+        if self.__objects.get(key) is not obj or \
+           self.__dirty.get(key) is obj:
+            return
+        with self.__lock:
+            self.__dirty[key] = obj
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            self.__put(key, obj)
+            with self.__lock:
+                self.__dirty[key] = obj
+
+    def bulk_new(self, objs):
+        """sets in __objects every object of objs, then saves them all
+        at once"""
+        objs = list(objs)
+        for obj in objs:
+            self.new(obj)
+        self.save()
+        return objs
+
+    def bulk_update(self, cls, rows):
+        """sets on the cls objects the attributes of rows, dictionaries
+        holding the id of the object to update, then saves them all at
+        once"""
+        now = datetime.utcnow()
+        for row in rows:
+            obj = self.get(cls, row["id"])
+            if obj is None:
+                continue
+            for key, value in row.items():
+                if key not in ("id", "created_at", "updated_at",
+                               "__class__"):
+                    setattr(obj, key, value)
+            obj.updated_at = now
+            self.new(obj)
+        self.save()
+
+    def __put(self, key, obj):
+        """stores obj under key in __objects and the indexes"""
+        self.__sync()
+        if self.__lazy:
+            self.__lazy.get(key.partition(".")[0], {}).pop(key, None)
+        old = self.__objects.get(key)
+        if old is not None and old is not obj:
+            self.__unindex(key, old)
+        self.__objects[key] = obj
+        self.__index(key, obj)
+        FileStorage.__indexed_len = len(self.__objects)
+
+    def __drop(self, key):
+        """removes key from __objects and the indexes"""
+        self.__sync()
+        if self.__lazy:
+            name = key.partition(".")[0]
+            if self.__lazy.get(name, {}).pop(key, None) is not None:
+                self.__order(name, key, False)
+        if key in self.__objects:
+            self.__unindex(key, self.__objects.pop(key))
+            FileStorage.__indexed_len = len(self.__objects)
 
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        with self.__lock:
+            dirty = FileStorage.__dirty
+            FileStorage.__dirty = {}
+        fragments = self.__fragments
+        with self.__locked(True):
+            changed = self.__signature() != FileStorage.__loaded
+            if self.__journaled:
+                self.__append(dirty, changed)
+                FileStorage.__loaded = self.__signature()
+                return
+            if changed:
+                # another process saved since we loaded: merge its changes
+                self.__load(dirty)
+            raws = self.__read(self.__lazy_entries()) if self.__lazy else ()
+            offsets = {} if self.__lazy_mode else None
+            tmp_path = self.__tmp_path()
+            try:
+                if self.__binary:
+                    self.__dump_binary(list(self.__objects.values()),
+                                       tmp_path)
+                else:
+                    self.__dump(list(self.__objects.items()), tmp_path,
+                                raws, offsets)
+                os.replace(tmp_path, self.__file_path)
+            except BaseException:
+                self.__remove(tmp_path)
+                raise
+            self.__journal.clear()
+            FileStorage.__loaded = self.__signature()
+            if offsets is not None:
+                self.__reopen(offsets)
+        if len(fragments) > len(self.__objects):
+            for key in [k for k in fragments if k not in self.__objects]:
+                del fragments[key]
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    @contextmanager
+    def __locked(self, exclusive):
+        """holds the advisory lock shared by every process using the JSON
+        file, exclusive for writers, while the block runs"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.__file_path + ".lock", 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive
+                        else fcntl.LOCK_SH)
+            yield
+
+    def __tmp_path(self):
+        """returns a temporary path, next to the JSON file, unique to this
+        process and thread"""
+        return "{}.{}-{}.tmp".format(self.__file_path, os.getpid(),
+                                     threading.get_ident())
+
+    def __remove(self, path):
+        """removes the file at path if it exists"""
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
+            os.remove(path)
+        except FileNotFoundError:
             pass
 
+    def __dump(self, items, path, raws=(), offsets=None):
+        """writes the (key, obj) pairs of items and the (key, JSON text)
+        pairs of raws as a JSON file at path, encoding only the objects
+        changed since they were last written. Fills offsets, if given,
+        with key -> (offset, length) of each value in the file"""
+        fragments = self.__fragments
+        parts = []
+        for key, obj in items:
+            cached = fragments.get(key)
+            count = changes(obj)
+            if cached is None or cached[0] is not obj or cached[3] != count:
+                prefix = json.dumps(key) + ": "
+                cached = (obj, prefix + json.dumps(obj.to_dict()),
+                          len(prefix), count)
+                fragments[key] = cached
+            parts.append(cached)
+        for key, raw in raws:
+            if not raw.isascii():
+                raw = json.dumps(json.loads(raw))
+            prefix = json.dumps(key) + ": "
+            parts.append((None, prefix + raw, len(prefix)))
+        if offsets is not None:
+            pos = 1
+            for key, part in zip([key for key, obj in items] +
+                                 [key for key, raw in raws], parts):
+                offsets[key] = (pos + part[2], len(part[1]) - part[2])
+                pos += len(part[1]) + 2
+        with open(path, 'w') as f:
+            f.write("{" + ", ".join([part[1] for part in parts]) + "}")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __dump_binary(self, objs, path):
+        """writes objs as a binary snapshot at path"""
+        with open(path, 'wb') as f:
+            binary_format.dump(((obj.__class__.__name__, attributes(obj))
+                                for obj in objs), f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __reopen(self, offsets):
+        """points the offsets of the objects not built yet into the JSON
+        file just written, and saves offsets as its index"""
+        f = open(self.__file_path, 'rb')
+        old = FileStorage.__lazy_file
+        FileStorage.__lazy_file = f
+        if old is not None:
+            old.close()
+        for bucket in self.__lazy.values():
+            for key in bucket:
+                bucket[key] = offsets[key]
+        self.__write_index(os.fstat(f.fileno()), offsets)
+
+    def __write_index(self, st, offsets):
+        """writes offsets next to the JSON file whose stat is st"""
+        keys = list(offsets)
+        index = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                 "ino": st.st_ino, "keys": keys,
+                 "offsets": [offsets[key][0] for key in keys],
+                 "lengths": [offsets[key][1] for key in keys]}
+        with open(self.__file_path + ".idx", 'w') as f:
+            json.dump(index, f)
+
+    def __read_index(self, f):
+        """returns the offsets saved for the JSON file f, or None if there
+        are none or they were saved for another version of the file"""
+        st = os.fstat(f.fileno())
+        try:
+            with open(self.__file_path + ".idx", 'r') as idx:
+                index = json.load(idx)
+        except (OSError, ValueError):
+            return None
+        if [index.get("size"), index.get("mtime_ns"), index.get("ino")] != \
+                [st.st_size, st.st_mtime_ns, st.st_ino]:
+            return None
+        return dict(zip(index["keys"], zip(index["offsets"],
+                                           index["lengths"])))
+
+    def __load_lazily(self):
+        """indexes the objects of the JSON file by offset without
+        building them, returns the keys of the file"""
+        try:
+            f = open(self.__file_path, 'rb')
+        except OSError:
+            return {}
+        offsets = self.__read_index(f)
+        if offsets is None:
+            text = io.TextIOWrapper(f, encoding="latin-1")
+            offsets = {}
+            try:
+                if os.fstat(f.fileno()).st_size:
+                    for key, offset, length in iter_offsets(text):
+                        offsets[key] = (offset, length)
+            except ValueError:
+                f.close()
+                raise
+            f = text.detach()
+            self.__write_index(os.fstat(f.fileno()), offsets)
+        old = FileStorage.__lazy_file
+        FileStorage.__lazy_file = f
+        if old is not None:
+            old.close()
+        # built objects equal to their JSON are kept, the others built
+        # again from the file when accessed
+        built = [(key, entry) for key, entry in offsets.items()
+                 if key in self.__objects]
+        same = set(key for key, raw in self.__read(built)
+                   if self.__unchanged(key, json.loads(raw)))
+        lazy = self.__lazy
+        lazy.clear()
+        self.__ordered.clear()
+        self.__pending.clear()
+        for key, entry in offsets.items():
+            if key in same:
+                continue
+            if key in self.__objects:
+                self.__drop(key)
+            name = key.partition(".")[0]
+            bucket = lazy.get(name)
+            if bucket is None:
+                bucket = lazy[name] = {}
+            bucket[key] = entry
+        return offsets
+
+    def __append(self, dirty, changed):
+        """appends the dirty objects to the journal, compacting it into
+        the JSON file in a background thread once it grows too big.
+        changed tells if another process saved since we loaded"""
+        records = []
+        for key, obj in dirty.items():
+            if obj is None:
+                records.append(["-", key])
+            else:
+                records.append(["+", key, obj.to_dict()])
+        self.__journal.append(records)
+        try:
+            limit = max(os.path.getsize(self.__file_path), self.__journal_min)
+        except OSError:
+            limit = self.__journal_min
+        compactor = FileStorage.__compactor
+        if self.__journal.size() <= limit or (compactor is not None and
+                                              compactor.is_alive()):
+            return
+        compaction_lock = self.__lock_compaction()
+        if compaction_lock is None:
+            return
+        if changed:
+            # the snapshot must hold what other processes logged too
+            self.__load(dirty)
+        self.__journal.rotate()
+        compactor = threading.Thread(target=self.__compact,
+                                     args=(list(self.__objects.items()),
+                                           self.__lazy_entries(),
+                                           compaction_lock))
+        FileStorage.__compactor = compactor
+        compactor.start()
+
+    def __lock_compaction(self):
+        """returns the open compaction lock file, or None if another
+        process or thread is already compacting the journal"""
+        f = open(self.__file_path + ".compact.lock", 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                return None
+        return f
+
+    def __compact(self, items, entries, compaction_lock):
+        """writes items and the entries not built yet as the new JSON file
+        and drops the rotated log"""
+        with compaction_lock:
+            tmp_path = self.__tmp_path()
+            offsets = {} if self.__lazy_mode else None
+            try:
+                if self.__binary:
+                    self.__dump_binary([obj for key, obj in items], tmp_path)
+                else:
+                    self.__dump(items, tmp_path, self.__read(entries),
+                                offsets)
+                with self.__locked(True):
+                    os.replace(tmp_path, self.__file_path)
+                    if offsets is not None:
+                        self.__write_index(os.stat(self.__file_path),
+                                           offsets)
+                    self.__journal.discard_old()
+            except BaseException:
+                self.__remove(tmp_path)
+                raise
+
+    def reload(self):
+        """deserializes the JSON file to __objects, then replays the
+        changes logged in the journal since it was written"""
+        with self.__lock:
+            dirty = dict(FileStorage.__dirty)
+        with self.__locked(False):
+            self.__load(dirty)
+
+    def __load(self, dirty):
+        """loads the JSON file and the journal, the lock being held.
+        Objects found in neither were deleted by another process and are
+        dropped, objects stored the same on disk are kept as they are,
+        then the changes of dirty, not saved yet, are applied again"""
+        FileStorage.__loaded = self.__signature()
+        self.__ordered.clear()
+        self.__pending.clear()
+        present = set()
+        if self.__lazy_mode:
+            present.update(self.__load_lazily())
+        elif self.__binary:
+            try:
+                with open(self.__file_path, 'rb') as f:
+                    for name, attrs in binary_format.load(f):
+                        key = name + "." + attrs["id"]
+                        obj = self.__objects.get(key)
+                        if obj is None or attributes(obj) != attrs:
+                            self.__put(key, classes[name](**attrs))
+                        present.add(key)
+            except FileNotFoundError:
+                pass
+        else:
+            try:
+                with open(self.__file_path, 'r') as f:
+                    if os.fstat(f.fileno()).st_size:
+                        for key, value in iter_items(f):
+                            if not self.__unchanged(key, value):
+                                self.__put(key, classes[value["__class__"]](
+                                    **value))
+                            present.add(key)
+            except FileNotFoundError:
+                pass
+        for record in self.__journal.replay():
+            if record[0] == "+":
+                obj = record[2]
+                if not self.__unchanged(record[1], obj):
+                    self.__put(record[1], classes[obj["__class__"]](**obj))
+                present.add(record[1])
+            else:
+                self.__drop(record[1])
+                present.discard(record[1])
+        for key in [key for key in self.__objects
+                    if key not in present and key not in dirty]:
+            self.__drop(key)
+        for key, obj in dirty.items():
+            if obj is None:
+                self.__drop(key)
+            else:
+                self.__put(key, obj)
+
+    def __unchanged(self, key, value):
+        """tells if the object stored under key has the to_dict() value
+        read from disk, so that callers holding it keep the stored one"""
+        obj = self.__objects.get(key)
+        return obj is not None and obj.to_dict() == value
+
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
+            self.__hydrate(key=key)
             if key in self.__objects:
-                del self.__objects[key]
+                self.__drop(key)
+                with self.__lock:
+                    self.__dirty[key] = None
+
+    def __signature(self):
+        """returns the stat of the JSON file and of the journal"""
+        signature = []
+        for path in [self.__file_path, self.__journal.path,
+                     self.__journal.old_path]:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                signature.append(None)
+        return signature
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method for deserializing the JSON file to objects
+        if another process changed it since this one loaded or saved it"""
+        if self.__single_writer:
+            return
+        if self.__signature() != FileStorage.__loaded:
+            self.reload()
 
-    def get(self, cls, id):
-        """ Return object based on class and ID, None otherwise. """
+    def get(self, cls, id, load=None):
+        """ Return object based on class and ID, None otherwise.
+        load is accepted for DBStorage compatibility"""
+        if type(cls) is str:
+            cls = classes.get(cls)
         if cls in classes.values():
             key = cls.__name__ + '.' + id
+            self.__hydrate(key=key)
             if key in self.__objects:
                 return self.__objects[key]
 
+    def get_many(self, cls, ids):
+        """ Return {id: object} for the ids of existing cls objects."""
+        found = {}
+        for id in set(ids):
+            obj = self.get(cls, id)
+            if obj is not None:
+                found[id] = obj
+        return found
+
+    def begin_scope(self):
+        """nothing to do when a request starts: objects are in memory"""
+
     def count(self, cls=None):
         """ Count all objects of a given class or in general."""
-        count = 0
         if cls is not None:
-            for obj in self.__objects.values():
-                if obj.__class__ is cls:
-                    count += 1
-        else:
-            for obj in self.__objects.values():
-                count += 1
-        return count
+            self.__sync()
+            if type(cls) is not str:
+                cls = cls.__name__
+            return (len(self.__by_class.get(cls, ())) +
+                    len(self.__lazy.get(cls, ())))
+        return len(self.__objects) + sum(map(len, self.__lazy.values()))
+
+    def counts(self):
+        """ Return the number of objects of each class."""
+        self.__sync()
+        return {name: len(self.__by_class.get(name, ())) +
+                len(self.__lazy.get(name, ())) for name in classes}
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Contains the Journal class
+"""
+
+import json
+import os
+import threading
+
+
+class Journal:
+    """append-only log of the changes saved by a FileStorage
+
+    Each line is a JSON list: ["+", <class name>.id, <to_dict()>] when an
+    object was created or updated, ["-", <class name>.id] when it was
+    deleted. While a snapshot is being compacted the current log is moved
+    aside to <path>.old, so replay() reads <path>.old then <path>.
+    """
+
+    def __init__(self, path):
+        """Instantiate a Journal writing to path"""
+        self.path = path
+        self.old_path = path + ".old"
+        self.__lock = threading.Lock()
+
+    def append(self, records):
+        """writes records at the end of the log"""
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        if not lines:
+            return
+        with self.__lock:
+            with open(self.path, 'a') as f:
+                f.write(lines)
+
+    def replay(self):
+        """yields the records of the log, oldest first"""
+        for path in (self.old_path, self.path):
+            try:
+                with open(path, 'r') as f:
+                    for line in f:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            # a write interrupted halfway through a line
+                            pass
+            except FileNotFoundError:
+                pass
+
+    def size(self):
+        """returns the size in bytes of the current log"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def rotate(self):
+        """moves the current log aside before a snapshot is compacted"""
+        with self.__lock:
+            if not os.path.exists(self.path):
+                return
+            if not os.path.exists(self.old_path):
+                os.replace(self.path, self.old_path)
+                return
+            # a previous compaction did not finish, keep both logs
+            with open(self.path, 'r') as f, open(self.old_path, 'a') as old:
+                old.write(f.read())
+            os.remove(self.path)
+
+    def discard_old(self):
+        """removes the log moved aside by rotate()"""
+        with self.__lock:
+            try:
+                os.remove(self.old_path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """removes the whole log, once a full snapshot holds its changes"""
+        self.discard_old()
+        with self.__lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
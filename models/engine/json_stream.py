@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Contains iter_items and iter_offsets, incremental readers for the JSON
+file written by FileStorage
+"""
+
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_non_space = re.compile(r'\S')
+
+
+class _Reader:
+    """reads JSON values from a text file one chunk at a time"""
+
+    def __init__(self, f, chunk_size):
+        """Instantiate a _Reader on the open file f"""
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        # offset in the file of self.buf[0]
+        self.base = 0
+        self.eof = False
+        # offset in the file of the last value returned by value()
+        self.start = 0
+
+    def fill(self):
+        """appends the next chunk of the file to the buffer"""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.base += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def skip(self):
+        """moves to the next non-whitespace character and returns it"""
+        while True:
+            match = _non_space.search(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return match.group()
+            if not self.fill():
+                raise ValueError("unexpected end of JSON data")
+
+    def char(self):
+        """consumes and returns the next non-whitespace character"""
+        char = self.skip()
+        self.pos += 1
+        return char
+
+    def expect(self, char):
+        """consumes char, raises ValueError if something else is next"""
+        found = self.char()
+        if found != char:
+            raise ValueError("expected {!r}, found {!r}".format(char, found))
+
+    def value(self):
+        """decodes and returns the next JSON value"""
+        self.skip()
+        self.start = self.base + self.pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self.eof or not self.fill():
+                    raise
+                continue
+            # a number may continue in the next chunk
+            if end < len(self.buf) or self.eof or not self.fill():
+                self.pos = end
+                return value
+
+
+def iter_items(f, chunk_size=1 << 16):
+    """yields the (key, value) pairs of the JSON object in the file f
+    without reading the whole file into memory"""
+    for key, value, reader in _iter_members(f, chunk_size):
+        yield key, value
+
+
+def iter_offsets(f, chunk_size=1 << 16):
+    """yields (key, offset, length) for each member of the JSON object in
+    the file f, where f.seek(offset) then f.read(length) returns the JSON
+    text of the value. Offsets are counted in characters of f: open the
+    file with encoding='latin-1' to get byte offsets."""
+    for key, value, reader in _iter_members(f, chunk_size):
+        yield key, reader.start, reader.base + reader.pos - reader.start
+
+
+def _iter_members(f, chunk_size):
+    """yields (key, value, reader) for each member of the JSON object in
+    the file f"""
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.skip() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        yield key, reader.value(), reader
+        char = reader.char()
+        if char == "}":
+            return
+        if char != ",":
+            raise ValueError("expected ',' or '}}', found {!r}".format(char))
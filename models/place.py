@@ -4,7 +4,8 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table, \
+    Index
 from sqlalchemy.orm import relationship
 
 if models.storage_t == 'db':
@@ -16,13 +17,22 @@ if models.storage_t == 'db':
                           Column('amenity_id', String(60),
                                  ForeignKey('amenities.id', onupdate='CASCADE',
                                             ondelete='CASCADE'),
-                                 primary_key=True))
+                                 primary_key=True),
+                          # the places of an amenity
+                          Index('ix_place_amenity_amenity_id', 'amenity_id'))
 
 
 class Place(BaseModel, Base):
     """Representation of Place """
     if models.storage_t == 'db':
         __tablename__ = 'places'
+        # the places of a city or a user, in id order for keyset
+        # pagination, and the places in a price or coordinates range
+        __table_args__ = (Index('ix_places_city_id', 'city_id', 'id'),
+                          Index('ix_places_user_id', 'user_id', 'id'),
+                          Index('ix_places_price_by_night', 'price_by_night'),
+                          Index('ix_places_latitude_longitude', 'latitude',
+                                'longitude'))
         city_id = Column(String(60), ForeignKey('cities.id'), nullable=False)
         user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
         name = Column(String(128), nullable=False)
@@ -59,20 +69,12 @@ class Place(BaseModel, Base):
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return list(models.storage.children(Place, self.id,
+                                                Review).values())
 
         @property
         def amenities(self):
             """getter attribute returns the list of Amenity instances"""
             from models.amenity import Amenity
-            amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
-                    amenity_list.append(amenity)
-            return amenity_list
+            return list(models.storage.children(Place, self.id,
+                                                Amenity).values())
@@ -4,13 +4,17 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 
 
 class Review(BaseModel, Base):
     """Representation of Review """
     if models.storage_t == 'db':
         __tablename__ = 'reviews'
+        # the reviews of a place or a user, in id order for keyset
+        # pagination
+        __table_args__ = (Index('ix_reviews_place_id', 'place_id', 'id'),
+                          Index('ix_reviews_user_id', 'user_id', 'id'))
         place_id = Column(String(60), ForeignKey('places.id'), nullable=False)
         user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
         text = Column(String(1024), nullable=False)
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatch class
+"""
+
+from api.v1.app import app
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+
+
+class TestBatch(unittest.TestCase):
+    """Test the POST /<resource>/batch route"""
+    def setUp(self):
+        """Add a State to storage"""
+        self.client = app.test_client()
+        self.state = State(name="Alabama")
+        models.storage.new(self.state)
+        models.storage.save()
+        self.state_id = self.state.id
+        self.states = [self.state_id]
+
+    def tearDown(self):
+        """Remove the States and their Cities from storage"""
+        for city in models.storage.all(City).values():
+            if city.state_id == self.state_id:
+                models.storage.delete(city)
+        for state_id in self.states:
+            state = models.storage.get(State, state_id)
+            if state is not None:
+                models.storage.delete(state)
+        models.storage.save()
+
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py',
+                                    'tests/test_api/test_v1/test_views/'
+                                    'test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_batch(self):
+        """Test that the Cities of the list are created"""
+        cities = [{"name": "c{}".format(i), "state_id": self.state_id}
+                  for i in range(3)]
+        response = self.client.post('/api/v1/cities/batch', json=cities)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([city["name"] for city in response.get_json()],
+                         ["c0", "c1", "c2"])
+        for city in response.get_json():
+            self.assertIsNotNone(models.storage.get(City, city["id"]))
+
+    def test_batch_ignores_ids_and_dates(self):
+        """Test that the ids and dates of the list are not used"""
+        cities = [{"name": "c0", "state_id": self.state_id,
+                   "id": self.state_id},
+                  {"name": "c1", "state_id": self.state_id,
+                   "created_at": "garbage", "updated_at": [1]}]
+        response = self.client.post('/api/v1/cities/batch', json=cities)
+        self.assertEqual(response.status_code, 201)
+        created = response.get_json()
+        self.assertEqual(len(set(city["id"] for city in created)), 2)
+        self.assertNotIn(self.state_id, [city["id"] for city in created])
+        self.assertNotIn("garbage", [city["created_at"] for city in created])
+        state = models.storage.get(State, self.state_id)
+        self.assertEqual(state.name, "Alabama")
+        response = self.client.post('/api/v1/states/batch',
+                                    json=[{"name": "Alaska",
+                                           "id": self.state_id}])
+        self.assertEqual(response.status_code, 201)
+        self.states.append(response.get_json()[0]["id"])
+        self.assertNotEqual(self.states[-1], self.state_id)
+        self.assertEqual(models.storage.get(State, self.state_id).name,
+                         "Alabama")
+
+    def test_batch_errors(self):
+        """Test that invalid lists are refused"""
+        for body, status in [({"name": "c"}, 400),
+                             (["c"], 400),
+                             ([{"name": "c"}], 400),
+                             ([{"name": "c", "state_id": "nope"}], 404),
+                             ([{"name": "c", "state_id": [1]}], 400),
+                             ([{"name": "c", "state_id": {"a": 1}}], 400),
+                             ([{"name": "c", "state_id": 1}], 400)]:
+            with self.subTest(body=body):
+                response = self.client.post('/api/v1/cities/batch',
+                                            json=body)
+                self.assertEqual(response.status_code, status)
+        response = self.client.post('/api/v1/nope/batch', json=[])
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs and TestCache classes
+"""
+
+from api.v1.app import app
+from api.v1.views import cache
+import inspect
+import models
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the cache module"""
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/views/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/cache.py',
+                                    'tests/test_api/test_v1/test_views/'
+                                    'test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_docstrings(self):
+        """Test for the docstrings of the cache module and its functions"""
+        self.assertTrue(len(cache.__doc__) > 1)
+        for name, func in inspect.getmembers(cache, inspect.isfunction):
+            if func.__module__ == cache.__name__:
+                with self.subTest(function=name):
+                    self.assertTrue(len(func.__doc__) > 1)
+
+
+class TestCache(unittest.TestCase):
+    """Test the cached GET /states/<id> responses"""
+    def setUp(self):
+        """Empty the cache and add a State to storage"""
+        cache.responses.clear()
+        self.addCleanup(cache.responses.clear)
+        self.client = app.test_client()
+        self.states = []
+        for name in ["Alabama", "Arizona", "Texas"]:
+            state = State(name=name)
+            models.storage.new(state)
+            self.states.append(state.id)
+        models.storage.save()
+
+    def tearDown(self):
+        """Remove the States left in storage"""
+        for state_id in self.states:
+            state = models.storage.get(State, state_id)
+            if state is not None:
+                models.storage.delete(state)
+        models.storage.save()
+
+    def url(self, i=0):
+        """returns the url of the i-th State"""
+        return '/api/v1/states/{}'.format(self.states[i])
+
+    def test_get(self):
+        """Test that a GET returns the State with an ETag"""
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Alabama")
+        self.assertIsNotNone(response.headers.get("ETag"))
+        again = self.client.get(self.url())
+        self.assertEqual(again.get_data(), response.get_data())
+        self.assertEqual(again.headers["ETag"], response.headers["ETag"])
+
+    def test_if_none_match(self):
+        """Test that a GET with the current ETag gets a 304"""
+        etag = self.client.get(self.url()).headers["ETag"]
+        response = self.client.get(self.url(),
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        response = self.client.get(self.url(),
+                                   headers={"If-None-Match": '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_put(self):
+        """Test that a GET after a PUT returns the new body"""
+        etag = self.client.get(self.url()).headers["ETag"]
+        response = self.client.put(self.url(), json={"name": "Alaska"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url(),
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Alaska")
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_other_writer(self):
+        """Test that a change keeping updated_at is not served stale"""
+        self.client.get(self.url())
+        state = models.storage.get(State, self.states[0])
+        updated_at = state.updated_at
+        state.name = "Alaska"
+        state.updated_at = updated_at
+        models.storage.new(state)
+        models.storage.save()
+        response = self.client.get(self.url())
+        self.assertEqual(response.get_json()["name"], "Alaska")
+
+    def test_delete(self):
+        """Test that a GET after a DELETE returns 404"""
+        self.client.get(self.url())
+        response = self.client.delete(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url()).status_code, 404)
+
+    def test_lru(self):
+        """Test that at most HBNB_API_CACHE_SIZE responses are kept"""
+        with mock.patch.object(cache, "cache_size", 2):
+            self.client.get(self.url(0))
+            self.client.get(self.url(1))
+            self.client.get(self.url(0))
+            self.client.get(self.url(2))
+            self.assertEqual(list(cache.responses),
+                             [("State", self.states[0]),
+                              ("State", self.states[2])])
+        with mock.patch.object(cache, "cache_size", 0):
+            cache.responses.clear()
+            self.client.get(self.url(1))
+            self.assertEqual(len(cache.responses), 0)
@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+"""
+Contains the TestPagination class
+"""
+
+from api.v1.app import app
+from api.v1.views import pagination
+import json
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import re
+import unittest
+from unittest import mock
+
+
+class TestPagination(unittest.TestCase):
+    """Test the paginated list routes"""
+    def setUp(self):
+        """Add a State with Cities, a City with Places and a Place with
+        Reviews to storage, and one more of each elsewhere"""
+        self.client = app.test_client()
+        storage = models.storage
+        self.objs = []
+
+        def add(obj):
+            """stores obj until tearDown"""
+            storage.new(obj)
+            self.objs.append(obj)
+            return obj
+
+        self.user = add(User(email="a@b.c", password="pwd"))
+        self.state = add(State(name="Alabama"))
+        other_state = add(State(name="Alaska"))
+        storage.save()
+        self.cities = [add(City(name="c{}".format(i),
+                                state_id=self.state.id)) for i in range(5)]
+        add(City(name="other", state_id=other_state.id))
+        storage.save()
+        city = self.cities[0]
+        self.places = [add(Place(name="p{}".format(i), city_id=city.id,
+                                 user_id=self.user.id)) for i in range(5)]
+        add(Place(name="other", city_id=self.cities[1].id,
+                  user_id=self.user.id))
+        storage.save()
+        place = self.places[0]
+        self.reviews = [add(Review(text="r{}".format(i), place_id=place.id,
+                                   user_id=self.user.id)) for i in range(5)]
+        add(Review(text="other", place_id=self.places[1].id,
+                   user_id=self.user.id))
+        storage.save()
+        self.ids = [obj.id for obj in self.objs]
+
+    def tearDown(self):
+        """Remove the objects of setUp from storage"""
+        for obj, obj_id in reversed(list(zip(self.objs, self.ids))):
+            obj = models.storage.get(obj.__class__, obj_id)
+            if obj is not None:
+                models.storage.delete(obj)
+                models.storage.save()
+
+    def follow(self, url):
+        """returns the pages of url, following the Link headers"""
+        pages = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.get_json())
+            link = response.headers.get("Link")
+            if link is None:
+                url = None
+            else:
+                url = re.match(r'<(.*)>; rel="next"$', link).group(1)
+        return pages
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/views/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pagination.py',
+                                    'tests/test_api/test_v1/test_views/'
+                                    'test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_follow_links(self):
+        """Test that the Link headers walk a whole collection in id order"""
+        for url, cls in [('/api/v1/states', State),
+                         ('/api/v1/users', User),
+                         ('/api/v1/amenities', Amenity)]:
+            with self.subTest(url=url):
+                pages = self.follow(url + '?limit=2')
+                ids = [obj["id"] for page in pages for obj in page]
+                for page in pages:
+                    self.assertLessEqual(len(page), 2)
+                self.assertEqual(ids, [obj.id for obj in
+                                       models.storage.page(cls,
+                                                           limit=10 ** 6)])
+
+    def test_nested_filters(self):
+        """Test that the nested routes only list the children of their
+        parent"""
+        for url, children in [
+                ('/api/v1/states/{}/cities'.format(self.state.id),
+                 self.cities),
+                ('/api/v1/cities/{}/places'.format(self.cities[0].id),
+                 self.places),
+                ('/api/v1/places/{}/reviews'.format(self.places[0].id),
+                 self.reviews)]:
+            with self.subTest(url=url):
+                pages = self.follow(url + '?limit=2')
+                self.assertEqual([len(page) for page in pages], [2, 2, 1])
+                self.assertEqual([obj["id"] for page in pages
+                                  for obj in page],
+                                 sorted(obj.id for obj in children))
+                url = url.replace(url.split('/')[-2], 'nope')
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_limit(self):
+        """Test the limit parameter, its default and its maximum"""
+        url = '/api/v1/states/{}/cities'.format(self.state.id)
+        for limit in ['0', '-1', 'x', '']:
+            with self.subTest(limit=limit):
+                response = self.client.get(url + '?limit=' + limit)
+                self.assertEqual(response.status_code, 400)
+        with mock.patch.object(pagination, "page_limit", 3):
+            self.assertEqual(len(self.client.get(url).get_json()), 3)
+        with mock.patch.object(pagination, "page_max", 4):
+            response = self.client.get(url + '?limit=50')
+            self.assertEqual(len(response.get_json()), 4)
+            self.assertIn("limit=4&", response.headers["Link"])
+        response = self.client.get(url + '?limit=5')
+        self.assertEqual(len(response.get_json()), 5)
+        self.assertIn("Link", response.headers)
+        last = sorted(city.id for city in self.cities)[-1]
+        response = self.client.get(url + '?limit=5&after=' + last)
+        self.assertEqual(response.get_json(), [])
+        self.assertNotIn("Link", response.headers)
+
+    def test_streamed_body(self):
+        """Test that a streamed page is the JSON array of storage.page()"""
+        ids = sorted(city.id for city in self.cities)
+        url = '/api/v1/states/{}/cities'.format(self.state.id)
+        filters = {"state_id": self.state.id}
+        for after, limit in [(None, 2), (ids[1], 2), (ids[3], 5),
+                             (ids[-1], 5)]:
+            with self.subTest(after=after, limit=limit):
+                query = '?limit={}'.format(limit)
+                if after is not None:
+                    query += '&after=' + after
+                response = self.client.get(url + query)
+                self.assertTrue(response.is_streamed)
+                self.assertEqual(response.mimetype, 'application/json')
+                body = json.loads(response.get_data(as_text=True))
+                page = models.storage.page(City, after, limit, filters)
+                self.assertEqual(body, [obj.to_dict() for obj in page])
+        response = self.client.get(url + '?after=' + ids[-1])
+        self.assertEqual(response.get_data(as_text=True), '[]\n')
@@ -2,10 +2,15 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
+import os
 import pep8 as pycodestyle
+import subprocess
+import sys
 import time
 import unittest
+import uuid
 from unittest import mock
 BaseModel = models.base_model.BaseModel
 module_doc = models.base_model.__doc__
@@ -96,6 +101,14 @@ class TestBaseModel(unittest.TestCase):
         self.assertNotEqual(inst1.created_at, inst2.created_at)
         self.assertNotEqual(inst1.updated_at, inst2.updated_at)
 
+    def test_datetime_kwargs(self):
+        """Test that datetime objects passed to __init__ are kept"""
+        created = datetime(2017, 9, 28, 21, 5, 54, 119427)
+        updated = datetime(2017, 9, 29, 21, 5, 54, 119427)
+        inst = BaseModel(created_at=created, updated_at=updated)
+        self.assertEqual(inst.created_at, created)
+        self.assertEqual(inst.updated_at, updated)
+
     def test_uuid(self):
         """Test that id is a valid uuid"""
         inst1 = BaseModel()
@@ -144,6 +157,86 @@ class TestBaseModel(unittest.TestCase):
         string = "[BaseModel] ({}) {}".format(inst.id, inst.__dict__)
         self.assertEqual(string, str(inst))
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_to_dict_cached(self):
+        """Test that to_dict is rebuilt only after the instance changed"""
+        inst = BaseModel()
+        first = inst.to_dict()
+        first["name"] = "changed by the caller"
+        with mock.patch("models.base_model.format_time") as format_time:
+            self.assertNotIn("name", inst.to_dict())
+            self.assertFalse(format_time.called)
+        inst.name = "Holberton"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+        del inst.name
+        self.assertNotIn("name", inst.to_dict())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_to_dict_changed_while_built(self):
+        """Test that to_dict does not cache a change made while it runs"""
+        inst = BaseModel()
+        inst.name = "old"
+        format_time = models.base_model.format_time
+
+        def change(value):
+            """sets name as another thread would, then formats value"""
+            inst.name = "new"
+            return format_time(value)
+
+        with mock.patch("models.base_model.format_time", side_effect=change):
+            self.assertEqual(inst.to_dict()["name"], "old")
+        self.assertEqual(inst.to_dict()["name"], "new")
+
+    def test_id_strategies(self):
+        """Test that every id strategy returns valid, unique UUIDs"""
+        for name, strategy in models.base_model.id_strategies.items():
+            ids = [strategy() for i in range(100)]
+            with self.subTest(strategy=name):
+                self.assertEqual(len(set(ids)), len(ids))
+                for value in ids:
+                    parsed = uuid.UUID(value)
+                    self.assertEqual(str(parsed), value)
+                    self.assertEqual(parsed.version, int(name[-1]))
+                    self.assertEqual(parsed.variant, uuid.RFC_4122)
+        before = models.base_model.uuid7()
+        time.sleep(0.002)
+        self.assertLess(before, models.base_model.uuid7())
+        with mock.patch("models.base_model.new_id", return_value="1-2"):
+            self.assertEqual(BaseModel().id, "1-2")
+
+    def test_parse_format_time(self):
+        """Test that parse_time and format_time match strptime/strftime"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for value in [datetime(2017, 3, 25, 2, 17, 6, 5),
+                      datetime(2017, 3, 25, 2, 17, 6)]:
+            string = value.strftime(t_format)
+            self.assertEqual(models.base_model.format_time(value), string)
+            self.assertEqual(models.base_model.parse_time(string), value)
+        for string in ["2017-03-25T02:17:06", "2017-03-25 02:17:06.000000",
+                       "2017-03-25T02:17:06.000+01"]:
+            with self.assertRaises(ValueError):
+                models.base_model.parse_time(string)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact(self):
+        """Test that compact models keep their attributes in slots"""
+        script = """if True:
+            import json
+            from models.place import Place
+            place = Place(city_id="c" * 36, name="Loft", rooms=3)
+            other = Place(city_id="c" * 36)
+            print(json.dumps([sorted(place.__dict__), place.number_rooms,
+                              place.city_id is other.city_id,
+                              sorted(place.to_dict()), str(place)[:7]]))
+        """
+        env = dict(os.environ, HBNB_FILE_COMPACT="1")
+        out = subprocess.run([sys.executable, "-c", script], env=env,
+                             check=True, stdout=subprocess.PIPE).stdout
+        self.assertEqual(json.loads(out.decode()),
+                         [["rooms"], 0, True,
+                          ["__class__", "city_id", "created_at", "id",
+                           "name", "rooms", "updated_at"], "[Place]"])
+
     @mock.patch('models.storage')
     def test_save(self, mock_storage):
         """Test that save method updates `updated_at` and calls
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the TestBinaryFormatDocs and TestBinaryFormat classes
+"""
+
+from datetime import datetime
+import inspect
+import io
+import json
+from models.engine import binary_format
+import os
+import pep8
+import unittest
+
+
+class TestBinaryFormatDocs(unittest.TestCase):
+    """Tests to check the documentation and style of binary_format"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.bf_f = inspect.getmembers(binary_format, inspect.isfunction)
+
+    def test_pep8_conformance_binary_format(self):
+        """Test that models/engine/binary_format.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/binary_format.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_binary_format(self):
+        """Test tests/test_models/test_engine/test_binary_format.py conforms
+        to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_binary_format.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_binary_format_module_docstring(self):
+        """Test for the binary_format.py module docstring"""
+        self.assertIsNot(binary_format.__doc__, None,
+                         "binary_format.py needs a docstring")
+        self.assertTrue(len(binary_format.__doc__) >= 1,
+                        "binary_format.py needs a docstring")
+
+    def test_binary_format_func_docstrings(self):
+        """Test for the presence of docstrings in binary_format functions"""
+        for func in self.bf_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Test the binary_format functions"""
+    records = [("State", {"id": "1", "name": "Alabama",
+                          "created_at": datetime(2017, 9, 28, 21, 5, 54,
+                                                 119427),
+                          "updated_at": datetime(1969, 12, 31, 23, 59, 59,
+                                                 999999)}),
+               ("Place", {"id": "2", "latitude": 37.7749, "max_guest": 10,
+                          "description": None, "amenity_ids": ["a", "b"]}),
+               ("State", {"id": "3", "nom": "Alaska"})]
+
+    def test_round_trip(self):
+        """Test that load returns what dump wrote."""
+        f = io.BytesIO()
+        binary_format.dump(self.records, f)
+        f.seek(0)
+        self.assertCountEqual(list(binary_format.load(f)), self.records)
+
+    def test_blocks(self):
+        """Test objects spread over several blocks."""
+        records = [("Review", {"id": str(i), "text": "t"})
+                   for i in range(binary_format.BLOCK_SIZE * 2 + 1)]
+        f = io.BytesIO()
+        binary_format.dump(records, f)
+        f.seek(0)
+        self.assertEqual(list(binary_format.load(f)), records)
+
+    def test_invalid(self):
+        """Test that a foreign or truncated file raises ValueError."""
+        f = io.BytesIO()
+        binary_format.dump(self.records, f)
+        for data in [b'{"State.1": {}}', f.getvalue()[:-1]]:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    list(binary_format.load(io.BytesIO(data)))
+
+    def test_convert(self):
+        """Test converting a JSON file written by FileStorage."""
+        obj = {"__class__": "City", "id": "4", "name": "Mobile",
+               "created_at": "2017-09-28T21:05:54.119427",
+               "updated_at": "2017-09-28T21:05:54.119572"}
+        with open("test_convert.json", "w") as f:
+            json.dump({"City.4": obj}, f)
+        try:
+            binary_format.convert("test_convert.json", "test_convert.hbnb")
+            with open("test_convert.hbnb", "rb") as f:
+                records = list(binary_format.load(f))
+        finally:
+            for path in ["test_convert.json", "test_convert.hbnb"]:
+                if os.path.exists(path):
+                    os.remove(path)
+        name, attrs = records[0]
+        self.assertEqual(name, "City")
+        self.assertEqual(attrs["name"], "Mobile")
+        self.assertEqual(attrs["created_at"],
+                         datetime(2017, 9, 28, 21, 5, 54, 119427))
+        self.assertNotIn("__class__", attrs)
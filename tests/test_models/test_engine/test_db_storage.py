@@ -17,7 +17,13 @@ from models.user import User
 import json
 import os
 import pep8
+import sqlalchemy
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import scoped_session
+import tempfile
 import unittest
+from unittest import mock
+import uuid
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -70,6 +76,15 @@ test_db_storage.py'])
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    def setUp(self):
+        """Test the storage the models use"""
+        self.storage = models.storage
+
+    def tearDown(self):
+        """Roll back what a test left in the session"""
+        if models.storage_t == 'db':
+            self.storage.close()
+
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_all_returns_dict(self):
         """Test that all returns a dictionaty"""
@@ -78,16 +93,17 @@ class TestFileStorage(unittest.TestCase):
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_all_no_class(self):
         """Test that all returns all rows when no class is passed"""
-        storage = DBStorage()
+        storage = self.storage
+        storage.new(State(name="Alabama"))
+        storage.save()
         new_dict = storage.all()
         self.assertEqual(type(new_dict), dict)
-        self.assertIs(new_dict, storage._DBStorage__objects)
         self.assertGreater(len(new_dict), 0)
 
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_all_with_class(self):
         """Test that all returns all rows of a certain class."""
-        storage = DBStorage()
+        storage = self.storage
         all_states = storage.all(State)
         for dict_obj in all_states.values():
             self.assertIsInstance(dict_obj, State)
@@ -95,7 +111,7 @@ class TestFileStorage(unittest.TestCase):
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_new(self):
         """test that new adds an object to the database"""
-        storage = DBStorage()
+        storage = self.storage
         old_all = storage.all()
         new_state = State()
         new_state.name = "Puerto Rico"
@@ -110,7 +126,7 @@ class TestFileStorage(unittest.TestCase):
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
-        storage = DBStorage()
+        storage = self.storage
         new_state = State(name="NewYork")
         storage.new(new_state)
         save_id = new_state.id
@@ -125,7 +141,7 @@ class TestFileStorage(unittest.TestCase):
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_delete(self):
         """Test that delete properly removes an object."""
-        storage = DBStorage()
+        storage = self.storage
         new_user = User(email="haha@hehe.com", password="abc",
                         first_name="Jhon", last_name="Wick")
         storage.new(new_user)
@@ -144,7 +160,8 @@ class TestFileStorage(unittest.TestCase):
         """Test that reload correctly reloads data from db."""
         og_session = self.storage._DBStorage__session
         self.storage.reload()
-        self.assertIsInstance(self.storage._DBStorage__session, Session)
+        self.assertIsInstance(self.storage._DBStorage__session,
+                              scoped_session)
         self.assertNotEqual(og_session, self.storage._DBStorage__session)
         self.storage._DBStorage__session.close()
         self.storage._DBStorage__session = og_session
@@ -154,7 +171,8 @@ class TestFileStorage(unittest.TestCase):
         """Test that the current session is correctly closed."""
         og_session = self.storage._DBStorage__session
         self.storage.reload()
-        self.assertIsInstance(self.storage._DBStorage__session, Session)
+        self.assertIsInstance(self.storage._DBStorage__session,
+                              scoped_session)
         self.assertNotEqual(og_session, self.storage._DBStorage__session)
         self.storage._DBStorage__session.close()
         self.storage._DBStorage__session = og_session
@@ -163,7 +181,7 @@ class TestFileStorage(unittest.TestCase):
     def test_get(self):
         """Test that get retrieves the correct object."""
         # Test correct ID
-        db = DBStorage()
+        db = self.storage
         inst1 = State()
         inst1.name = "Alabama"
         db.new(inst1)
@@ -172,7 +190,7 @@ class TestFileStorage(unittest.TestCase):
         state = db.get("State", new_id)
         self.assertEqual(state.name, "Alabama")
         # Test incorrect class
-        inst2 = State()
+        inst2 = State(name="Alaska")
         db.new(inst2)
         new_id = inst2.id
         db.save()
@@ -187,7 +205,7 @@ class TestFileStorage(unittest.TestCase):
     def test_count(self):
         """Test that count returns the correct number of objects."""
         # Test with class parameter
-        db = DBStorage()
+        db = self.storage
         old_count = db.count(State)
         new = State(name="Alabama")
         db.new(new)
@@ -201,3 +219,259 @@ class TestFileStorage(unittest.TestCase):
         db.save()
         new_count = db.count()
         self.assertEqual(old_count + 1, new_count)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts returns the count of every class."""
+        db = models.storage
+        db.new(State(name="Alabama"))
+        db.save()
+        counts = db.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name, clss in classes.items():
+            self.assertEqual(counts[name], db.count(clss))
+        self.assertEqual(sum(counts.values()), db.count())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that pool_stats reports the pool usage."""
+        db = models.storage
+        db.count(State)
+        stats = db.pool_stats()
+        if not stats:
+            self.skipTest("the database has no connection pool")
+        self.assertEqual(stats["size"],
+                         int(os.getenv('HBNB_MYSQL_POOL_SIZE', 5)))
+        self.assertGreater(stats["checkouts"], 0)
+        self.assertGreaterEqual(stats["wait_max"], 0)
+        self.assertLessEqual(stats["wait_max"], stats["wait_total"])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_children(self):
+        """Test that children queries the rows linked to a parent."""
+        db = models.storage
+        state = State(name="Alabama")
+        other = State(name="Arizona")
+        db.new(state)
+        db.new(other)
+        db.save()
+        city1 = City(name="c1", state_id=state.id)
+        city2 = City(name="c2", state_id=other.id)
+        db.new(city1)
+        db.new(city2)
+        db.save()
+        cities = db.children(State, state.id, City)
+        self.assertEqual(cities, {"City." + city1.id: city1})
+        self.assertEqual(db.children("State", state.id, "City"), cities)
+        self.assertEqual(db.children(State, state.id, Amenity), {})
+        self.assertEqual(db.children("Nope", state.id, City), {})
+        db.delete(city1)
+        db.save()
+        self.assertEqual(db.children(State, state.id, City), {})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page(self):
+        """Test that page walks the rows of a class in id order."""
+        db = models.storage
+        state = State(name="Alabama")
+        db.new(state)
+        db.save()
+        cities = [City(name="c{}".format(i), state_id=state.id)
+                  for i in range(5)]
+        for city in cities:
+            db.new(city)
+        db.save()
+        ids = sorted(city.id for city in cities)
+        page = db.page(City, limit=2, filters={"state_id": state.id})
+        self.assertEqual([city.id for city in page], ids[:2])
+        page = db.page(City, page[-1].id, 10, {"state_id": state.id})
+        self.assertEqual([city.id for city in page], ids[2:])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_stream(self):
+        """Test that stream yields the rows up to the cursor."""
+        db = models.storage
+        states = [State(name="s{}".format(i)) for i in range(5)]
+        for state in states:
+            db.new(state)
+        db.save()
+        ids = sorted(state.id for state in db.page(State, limit=10 ** 6))
+        until = db.cursor(State, ids[0], 3)
+        self.assertEqual(until, ids[3])
+        self.assertEqual([state.id for state in db.stream(State, ids[0],
+                                                          None, until)],
+                         ids[1:4])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_load(self):
+        """Test that all and get load the named relationships along."""
+        db = models.storage
+        states = [State(name="s{}".format(i)) for i in range(3)]
+        for state in states:
+            db.new(state)
+        db.save()
+        for state in states:
+            db.new(City(name="c", state_id=state.id))
+        db.save()
+        db.close()
+        queries = []
+        engine = db._DBStorage__engine
+
+        def count(*args):
+            """counts the statements sent to the database"""
+            queries.append(args[2])
+        event.listen(engine, "before_cursor_execute", count)
+        self.addCleanup(event.remove, engine, "before_cursor_execute", count)
+        loaded = db.all(State, load=["cities"])
+        for state in loaded.values():
+            state.cities
+        self.assertEqual(len(queries), 2)
+        db.close()
+        del queries[:]
+        state = db.get(State, states[0].id, load=["cities.places"])
+        self.assertEqual(len(state.cities), 1)
+        state.cities[0].places
+        self.assertEqual(len(queries), 3)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_new_update(self):
+        """Test that bulk_new and bulk_update write every row."""
+        db = models.storage
+        states = db.bulk_new(State(name="s{}".format(i)) for i in range(3))
+        db.bulk_update(State, [{"id": states[0].id, "name": "a"},
+                               {"id": "no such id", "name": "b"}])
+        db.close()
+        self.assertEqual(db.get(State, states[0].id).name, "a")
+        self.assertEqual(db.get(State, states[2].id).name, "s2")
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_scope(self):
+        """Test that get and get_many reuse what they found in a scope."""
+        db = models.storage
+        state = State(name="Alabama")
+        db.new(state)
+        db.save()
+        db.close()
+        queries = []
+        engine = db._DBStorage__engine
+
+        def count(*args):
+            """counts the statements sent to the database"""
+            queries.append(args[2])
+        event.listen(engine, "before_cursor_execute", count)
+        self.addCleanup(event.remove, engine, "before_cursor_execute", count)
+        db.begin_scope()
+        self.addCleanup(db.close)
+        found = db.get_many(State, [state.id, "no such id"])
+        self.assertEqual(list(found), [state.id])
+        self.assertEqual(len(queries), 1)
+        self.assertIs(db.get(State, state.id), found[state.id])
+        self.assertIsNone(db.get(State, "no such id"))
+        self.assertEqual(len(queries), 1)
+        db.delete(found[state.id])
+        self.assertIsNone(db.get(State, state.id))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_replica_routing(self):
+        """Test that a session reads from the replicas until it writes."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        urls = ["sqlite:///{}/{}.db".format(tmp.name, name)
+                for name in ("primary", "replica1", "replica2")]
+        env = {"HBNB_DB_URL": urls[0], "HBNB_ENV": "test",
+               "HBNB_MYSQL_REPLICA_HOSTS": " {}, ,{}".format(*urls[1:])}
+        with mock.patch.dict(os.environ, env):
+            db = DBStorage()
+        db.reload()
+        replicas = db._DBStorage__replicas
+        self.assertEqual([str(engine.url) for engine in replicas], urls[1:])
+        for engine in replicas:
+            models.base_model.Base.metadata.create_all(engine)
+        state = State(name="Alabama")
+        db.new(state)
+        self.assertEqual(db.count(State), 1)
+        db.save()
+        db.close()
+        self.assertIsNone(db.get(State, state.id))
+        self.assertEqual(db.count(State), 0)
+        db.close()
+        other = State(name="Arizona")
+        db.new(other)
+        self.assertEqual(db.get(State, state.id).id, state.id)
+        db.save()
+        db.close()
+        self.assertEqual(db.count(State), 0)
+        db.save()
+        self.assertEqual(db.count(State), 2)
+        db.close()
+        self.assertEqual(db.count(State), 0)
+        db.delete(other)
+        self.assertEqual(db.count(State), 1)
+        db.save()
+        db.close()
+        self.assertEqual(db.count(State), 0)
+        db.close()
+        for engine in [db._DBStorage__engine] + replicas:
+            engine.dispose()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_migrate(self):
+        """Test that migrate adds the indexes missing from old tables."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        engine = create_engine("sqlite:///{}/old.db".format(tmp.name))
+        metadata = models.base_model.Base.metadata
+        metadata.create_all(engine)
+        names = []
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(engine)
+                names.append(index.name)
+        self.assertIn("ix_cities_state_id", names)
+        self.assertEqual(sorted(DBStorage.migrate(engine)), sorted(names))
+        self.assertEqual(DBStorage.migrate(engine), [])
+        found = [index["name"] for index in
+                 sqlalchemy.inspect(engine).get_indexes("places")]
+        self.assertIn("ix_places_price_by_night", found)
+        engine.dispose()
+
+    def explain(self, statement):
+        """returns the query plan of statement as a string"""
+        engine = self.storage._DBStorage__engine
+        sql = str(statement.compile(engine, compile_kwargs={
+            "literal_binds": True}))
+        with engine.connect() as connection:
+            if engine.dialect.name == "sqlite":
+                rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)
+                return " ".join(row[-1] for row in rows)
+            rows = connection.exec_driver_sql("EXPLAIN " + sql)
+            return " ".join("{} {}".format(row._mapping["key"],
+                                           row._mapping["possible_keys"])
+                            for row in rows)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_query_plans(self):
+        """Test that the usual queries use the indexes of the models."""
+        place_amenity = models.place.place_amenity
+        plans = {
+            "ix_cities_state_id": select(City).where(
+                City.state_id == "s", City.id > "a").order_by(City.id),
+            "ix_places_city_id": select(Place).where(
+                Place.city_id == "c").order_by(Place.id),
+            "ix_places_user_id": select(Place).where(Place.user_id == "u"),
+            "ix_reviews_place_id": select(Review).where(
+                Review.place_id == "p").order_by(Review.id),
+            "ix_reviews_user_id": select(Review).where(
+                Review.user_id == "u"),
+            "ix_users_email": select(User).where(User.email == "a@b.c"),
+            "ix_places_price_by_night": select(Place).where(
+                Place.price_by_night.between(50, 100)),
+            "ix_places_latitude_longitude": select(Place).where(
+                Place.latitude.between(37.7, 37.8),
+                Place.longitude.between(-122.5, -122.4)),
+            "ix_place_amenity_amenity_id": select(place_amenity).where(
+                place_amenity.c.amenity_id == "a"),
+        }
+        for name, statement in plans.items():
+            with self.subTest(index=name):
+                self.assertIn(name, self.explain(statement))
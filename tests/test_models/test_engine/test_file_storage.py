@@ -7,6 +7,7 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import file_storage
+from models.engine.journal import Journal
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -18,6 +19,7 @@ import json
 import os
 import pep8
 import unittest
+from unittest import mock
 import uuid
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
@@ -200,3 +202,598 @@ class TestFileStorage(unittest.TestCase):
         fs.save()
         new_count = fs.count()
         self.assertEqual(old_count + 1, new_count)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts returns the count of every class."""
+        fs = FileStorage()
+        fs.new(City(name="Mobile"))
+        counts = fs.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name, clss in classes.items():
+            with self.subTest(cls=name):
+                self.assertEqual(counts[name], fs.count(clss))
+        self.assertEqual(sum(counts.values()), fs.count())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_with_class(self):
+        """Test that all(cls) only returns objects of that class."""
+        fs = FileStorage()
+        state = State()
+        city = City()
+        fs.new(state)
+        fs.new(city)
+        states = fs.all(State)
+        self.assertIn("State." + state.id, states)
+        self.assertNotIn("City." + city.id, states)
+        for obj in states.values():
+            self.assertIs(type(obj), State)
+        self.assertEqual(fs.all("State"), states)
+        self.assertEqual(fs.all(State, load=["cities"]), states)
+        self.assertIs(fs.get(State, state.id, load=["cities"]), state)
+        fs.delete(state)
+        fs.delete(city)
+        self.assertNotIn("State." + state.id, fs.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_matches_all(self):
+        """Test that count(cls) stays in sync with all(cls)."""
+        fs = FileStorage()
+        for cls in classes.values():
+            fs.new(cls())
+        for name, cls in classes.items():
+            with self.subTest(cls=name):
+                self.assertEqual(fs.count(cls), len(fs.all(cls)))
+        self.assertEqual(fs.count(), len(fs.all()))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_index_follows_objects_swap(self):
+        """Test that the class index is rebuilt when __objects changes."""
+        fs = FileStorage()
+        save = FileStorage._FileStorage__objects
+        state = State()
+        FileStorage._FileStorage__objects = {"State." + state.id: state}
+        self.assertEqual(fs.count(State), 1)
+        self.assertEqual(fs.count(City), 0)
+        fs.all().pop("State." + state.id)
+        self.assertEqual(fs.count(State), 0)
+        FileStorage._FileStorage__objects = save
+        self.assertEqual(fs.count(), len(save))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_children(self):
+        """Test that children returns the objects linked to a parent."""
+        fs = FileStorage()
+        state = State()
+        city1 = City(state_id=state.id)
+        city2 = City(state_id="other")
+        for obj in [state, city1, city2]:
+            fs.new(obj)
+        cities = fs.children(State, state.id, City)
+        self.assertEqual(cities, {"City." + city1.id: city1})
+        self.assertEqual(fs.children("State", state.id, "City"), cities)
+        fs.delete(city1)
+        self.assertEqual(fs.children(State, state.id, City), {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Test that page walks the objects of a class in id order."""
+        fs = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.addCleanup(setattr, FileStorage, "_FileStorage__objects", save)
+        state = State(name="Alabama")
+        cities = [City(name="c{}".format(i), state_id=state.id)
+                  for i in range(5)]
+        for obj in [state, City(name="other")] + cities:
+            fs.new(obj)
+        ids = sorted(city.id for city in cities)
+        page = fs.page(City, limit=2, filters={"state_id": state.id})
+        self.assertEqual([city.id for city in page], ids[:2])
+        page = fs.page(City, page[-1].id, 10, {"state_id": state.id})
+        self.assertEqual([city.id for city in page], ids[2:])
+        self.assertEqual(len(fs.page(City, limit=10)), 6)
+        fs.delete(cities[0])
+        extra = City(name="c5", state_id=state.id)
+        fs.new(extra)
+        ids = sorted([city.id for city in cities[1:]] + [extra.id])
+        page = fs.page(City, limit=10, filters={"name": "c5"})
+        self.assertEqual(page, [extra])
+        all_ids = [city.id for city in fs.page(City, limit=10)]
+        self.assertEqual(all_ids, sorted(all_ids))
+        self.assertEqual(len(all_ids), 6)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_stream(self):
+        """Test that stream yields the objects up to a cursor lazily."""
+        fs = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.addCleanup(setattr, FileStorage, "_FileStorage__objects", save)
+        states = [State(name="s{}".format(i)) for i in range(5)]
+        for state in states:
+            fs.new(state)
+        ids = sorted(state.id for state in states)
+        self.assertEqual(fs.cursor(State, limit=3), ids[2])
+        self.assertIsNone(fs.cursor(State, ids[2], 3))
+        stream = fs.stream(State, ids[0], until_id=ids[3])
+        self.assertEqual(next(stream).id, ids[1])
+        fs.delete(fs.get(State, ids[2]))
+        self.assertEqual([state.id for state in stream], [ids[3]])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_buffers_writes(self):
+        """Test that writes after page() are merged into the order on read."""
+        fs = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        self.addCleanup(setattr, FileStorage, "_FileStorage__objects", save)
+        states = [State(name="s{}".format(i)) for i in range(10)]
+        for state in states[:5]:
+            fs.new(state)
+        self.assertEqual(len(fs.page(State, limit=10)), 5)
+        keys = FileStorage._FileStorage__ordered["State"]
+        for state in states[5:]:
+            fs.new(state)
+        fs.delete(states[0])
+        fs.delete(states[6])
+        fs.new(states[0])
+        self.assertEqual(len(keys), 5)
+        ids = sorted(state.id for state in states if state is not states[6])
+        self.assertEqual([state.id for state in fs.page(State, limit=20)],
+                         ids)
+        self.assertEqual(len(keys), 9)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk_new(self):
+        """Test that bulk_new stores every object with a single save."""
+        fs = FileStorage()
+        states = [State(name="s{}".format(i)) for i in range(3)]
+        with mock.patch.object(FileStorage, "save") as save:
+            self.assertEqual(fs.bulk_new(iter(states)), states)
+        self.assertEqual(save.call_count, 1)
+        for state in states:
+            self.assertIs(fs.get(State, state.id), state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk_update(self):
+        """Test that bulk_update changes the objects with a single save."""
+        fs = FileStorage()
+        states = [State(name="s{}".format(i)) for i in range(2)]
+        fs.bulk_new(states)
+        created_at = states[0].created_at
+        with mock.patch.object(FileStorage, "save") as save:
+            fs.bulk_update(State, [{"id": states[0].id, "name": "a",
+                                    "created_at": "2017-01-01"},
+                                   {"id": str(uuid.uuid4()), "name": "b"}])
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(states[0].name, "a")
+        self.assertEqual(states[0].created_at, created_at)
+        self.assertEqual(states[1].name, "s1")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_many(self):
+        """Test that get_many returns the objects that exist."""
+        fs = FileStorage()
+        fs.begin_scope()
+        state = State(name="Alabama")
+        fs.new(state)
+        missing = str(uuid.uuid4())
+        self.assertEqual(fs.get_many(State, [state.id, missing, state.id]),
+                         {state.id: state})
+        self.assertEqual(fs.get_many(City, [state.id]), {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_children_after_attribute_change(self):
+        """Test that changing a foreign key moves the object in the index."""
+        fs = FileStorage()
+        place = Place()
+        review = Review(place_id="nowhere")
+        fs.new(place)
+        fs.new(review)
+        self.assertNotIn(review, fs.children(Place, place.id, Review).values())
+        review.place_id = place.id
+        self.assertIn(review, fs.children(Place, place.id, Review).values())
+        self.assertEqual(fs.children(Place, "nowhere", Review), {})
+        fs.delete(review)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_only_encodes_changes(self):
+        """Test that save reuses the JSON of unchanged objects."""
+        fs = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        try:
+            changed = State(name="Alabama")
+            unchanged = State(name="Alaska")
+            fs.new(changed)
+            fs.new(unchanged)
+            fs.save()
+            to_dict = State.to_dict
+            with mock.patch.object(State, "to_dict", autospec=True,
+                                   side_effect=to_dict) as mocked:
+                changed.name = "Arizona"
+                changed.save()
+                # changed without new(), saved all the same
+                unchanged.name = "Alaska"
+                fs.save()
+            self.assertEqual([call[0][0] for call in mocked.call_args_list],
+                             [changed, unchanged])
+            fs.delete(changed)
+            fs.save()
+        finally:
+            FileStorage._FileStorage__objects = save
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js, {"State." + unchanged.id: unchanged.to_dict()})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_unchanged_file(self):
+        """Test that close only reloads a file changed by someone else."""
+        fs = FileStorage()
+        fs.new(State(name="Alabama"))
+        fs.save()
+        with mock.patch.object(fs, "reload") as reload:
+            fs.close()
+        self.assertFalse(reload.called)
+        with open("file.json", "r") as f:
+            js = f.read()
+        os.remove("file.json")
+        with open("file.json", "w") as f:
+            f.write(js)
+        with mock.patch.object(fs, "reload") as reload:
+            fs.close()
+        self.assertTrue(reload.called)
+        fs.reload()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_is_atomic(self):
+        """Test that a failed save leaves the previous file in place."""
+        fs = FileStorage()
+        fs.new(State(name="Alabama"))
+        fs.save()
+        with open("file.json", "r") as f:
+            js = f.read()
+        fs.new(State(name="Alaska"))
+        with mock.patch.object(file_storage.os, "fsync",
+                               side_effect=OSError("disk full")):
+            self.assertRaises(OSError, fs.save)
+        with open("file.json", "r") as f:
+            self.assertEqual(f.read(), js)
+        self.assertEqual([path for path in os.listdir(".")
+                          if path.endswith(".tmp")], [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_merges_other_writer(self):
+        """Test that save keeps the objects saved by another process."""
+        fs = FileStorage()
+        mine = State(name="Alabama")
+        fs.new(mine)
+        fs.save()
+        other = State(name="Alaska")
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["State." + other.id] = other.to_dict()
+        with open("file.json.tmp", "w") as f:
+            json.dump(js, f)
+        os.replace("file.json.tmp", "file.json")
+        fs.new(State(name="Arizona"))
+        fs.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertIn("State." + mine.id, js)
+        self.assertIn("State." + other.id, js)
+        self.assertEqual(fs.get(State, other.id).name, "Alaska")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_merges_other_writer_delete(self):
+        """Test that save and close drop the objects another process
+        deleted."""
+        fs = FileStorage()
+        gone = State(name="Alabama")
+        kept = State(name="Alaska")
+        closed = State(name="Arizona")
+        for obj in [gone, kept, closed]:
+            fs.new(obj)
+        fs.save()
+
+        def delete_on_disk(obj):
+            """removes obj from the file like another process would"""
+            with open("file.json", "r") as f:
+                js = json.load(f)
+            del js["State." + obj.id]
+            with open("file.json.tmp", "w") as f:
+                json.dump(js, f)
+            os.replace("file.json.tmp", "file.json")
+
+        delete_on_disk(gone)
+        kept.name = "Arkansas"
+        fs.new(kept)
+        fs.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertNotIn("State." + gone.id, js)
+        self.assertEqual(js["State." + kept.id]["name"], "Arkansas")
+        self.assertIsNone(fs.get(State, gone.id))
+        delete_on_disk(closed)
+        fs.close()
+        self.assertIsNone(fs.get(State, closed.id))
+        self.assertIs(fs.get(State, kept.id).__class__, State)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_merges_keeps_instances(self):
+        """Test that a merging save keeps the stored objects and their
+        changes made without new()."""
+        fs = FileStorage()
+        edited = State(name="Alabama")
+        kept = State(name="Alaska")
+        for obj in [edited, kept]:
+            fs.new(obj)
+        fs.save()
+        other = State(name="Arizona")
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["State." + other.id] = other.to_dict()
+        with open("file.json.tmp", "w") as f:
+            json.dump(js, f)
+        os.replace("file.json.tmp", "file.json")
+        edited.name = "Arkansas"
+        fs.save()
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js["State." + edited.id]["name"], "Arkansas")
+        self.assertIn("State." + other.id, js)
+        self.assertIs(fs.get(State, edited.id), edited)
+        self.assertIs(fs.get(State, kept.id), kept)
+        self.assertEqual(fs.get(State, other.id).name, "Arizona")
+
+
+class TestFileStorageJournal(unittest.TestCase):
+    """Test FileStorage with HBNB_FILE_JOURNAL=1"""
+    def setUp(self):
+        """Switch FileStorage to a journal of its own"""
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__journal,
+                      FileStorage._FileStorage__journaled,
+                      FileStorage._FileStorage__loaded)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "test_journal.json"
+        FileStorage._FileStorage__journal = Journal("test_journal.json.log")
+        FileStorage._FileStorage__journaled = True
+        self.journal = FileStorage._FileStorage__journal
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        compactor = FileStorage._FileStorage__compactor
+        if compactor is not None:
+            compactor.join()
+        self.journal.clear()
+        for path in ["test_journal.json", "test_journal.json.lock",
+                     "test_journal.json.compact.lock"]:
+            if os.path.exists(path):
+                os.remove(path)
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__journal,
+         FileStorage._FileStorage__journaled,
+         FileStorage._FileStorage__loaded) = self.saved
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_appends(self):
+        """Test that save only logs the changed objects."""
+        fs = FileStorage()
+        state = State(name="Alabama")
+        city = City(name="Mobile")
+        fs.new(state)
+        fs.new(city)
+        fs.save()
+        fs.delete(city)
+        fs.save()
+        fs.save()
+        records = list(self.journal.replay())
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0], ["+", "State." + state.id,
+                                      state.to_dict()])
+        self.assertEqual(records[2], ["-", "City." + city.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_replays(self):
+        """Test that reload applies the journal on top of the file."""
+        fs = FileStorage()
+        state = State(name="Alabama")
+        fs.new(state)
+        fs.save()
+        state.name = "Alaska"
+        state.save()
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        self.assertEqual(fs.get(State, state.id).name, "Alaska")
+        self.assertEqual(fs.count(State), 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_logs_changed_objects(self):
+        """Test that save logs the objects changed without new()."""
+        fs = FileStorage()
+        state = State(name="Alabama")
+        fs.new(state)
+        fs.save()
+        state.name = "Alaska"
+        State(name="Arizona").name = "not stored"
+        self.assertEqual(FileStorage._FileStorage__dirty,
+                         {"State." + state.id: state})
+        fs.save()
+        fs.save()
+        self.assertEqual(len(list(self.journal.replay())), 2)
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        loaded = fs.get(State, state.id)
+        self.assertEqual(loaded.name, "Alaska")
+        fs.save()
+        self.assertEqual(len(list(self.journal.replay())), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compaction(self):
+        """Test that a big journal is compacted into the file."""
+        fs = FileStorage()
+        min_size = FileStorage._FileStorage__journal_min
+        FileStorage._FileStorage__journal_min = 0
+        try:
+            state = State(name="Alabama")
+            fs.new(state)
+            fs.save()
+            FileStorage._FileStorage__compactor.join()
+        finally:
+            FileStorage._FileStorage__journal_min = min_size
+        self.assertEqual(list(self.journal.replay()), [])
+        with open("test_journal.json", "r") as f:
+            self.assertIn("State." + state.id, json.load(f))
+
+
+class TestFileStorageLazy(unittest.TestCase):
+    """Test FileStorage with HBNB_FILE_LAZY=1"""
+    def setUp(self):
+        """Write a few objects to a file of their own"""
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__lazy_mode,
+                      FileStorage._FileStorage__loaded)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "test_lazy.json"
+        self.states = [State(name="Alabama"), State(name="Alaska")]
+        self.city = City(name="Mobile", state_id=self.states[0].id)
+        fs = FileStorage()
+        for obj in self.states + [self.city]:
+            fs.new(obj)
+        fs.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy_mode = True
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        FileStorage._FileStorage__lazy.clear()
+        if FileStorage._FileStorage__lazy_file is not None:
+            FileStorage._FileStorage__lazy_file.close()
+            FileStorage._FileStorage__lazy_file = None
+        for path in ["test_lazy.json", "test_lazy.json.idx",
+                     "test_lazy.json.lock"]:
+            if os.path.exists(path):
+                os.remove(path)
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__lazy_mode,
+         FileStorage._FileStorage__loaded) = self.saved
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_builds_nothing(self):
+        """Test that reload only indexes the file."""
+        fs = FileStorage()
+        fs.reload()
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(fs.count(State), 2)
+        self.assertEqual(fs.count(), 3)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_builds_one(self):
+        """Test that get only builds the object asked for."""
+        fs = FileStorage()
+        fs.reload()
+        state = fs.get(State, self.states[1].id)
+        self.assertEqual(state.name, "Alaska")
+        self.assertEqual(state.created_at, self.states[1].created_at)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+        self.assertIs(fs.get(State, self.states[1].id), state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_builds_page(self):
+        """Test that page only builds the objects it returns."""
+        fs = FileStorage()
+        fs.reload()
+        ids = sorted(state.id for state in self.states)
+        page = fs.page(State, ids[0], 1)
+        self.assertEqual([state.id for state in page], ids[1:])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+        self.assertEqual(fs.page(State, ids[1]), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_builds_class(self):
+        """Test that all(cls) builds the objects of cls only."""
+        fs = FileStorage()
+        fs.reload()
+        self.assertEqual(len(fs.all(State)), 2)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+        self.assertEqual(len(fs.all()), 3)
+        self.assertEqual(fs.count(), 3)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_keeps_unbuilt_objects(self):
+        """Test that save writes the objects that were never built."""
+        fs = FileStorage()
+        fs.reload()
+        state = fs.get(State, self.states[0].id)
+        state.name = "Arizona"
+        state.save()
+        fs.delete(fs.get(City, self.city.id))
+        fs.save()
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+        with open("test_lazy.json", "r") as f:
+            js = json.load(f)
+        self.assertEqual(js, {"State." + state.id: state.to_dict(),
+                              "State." + self.states[1].id:
+                              self.states[1].to_dict()})
+        self.assertEqual(fs.get(State, self.states[1].id).name, "Alaska")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_index_file(self):
+        """Test that the saved offsets are reused while the file is
+        unchanged."""
+        fs = FileStorage()
+        fs.reload()
+        self.assertTrue(os.path.exists("test_lazy.json.idx"))
+        with mock.patch.object(file_storage, "iter_offsets") as scan:
+            fs.reload()
+        self.assertFalse(scan.called)
+        self.assertEqual(fs.get(City, self.city.id).name, "Mobile")
+
+
+class TestFileStorageBinary(unittest.TestCase):
+    """Test FileStorage with HBNB_FILE_FORMAT=binary"""
+    def setUp(self):
+        """Switch FileStorage to a binary file of its own"""
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__binary,
+                      FileStorage._FileStorage__loaded)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = "test_binary.hbnb"
+        FileStorage._FileStorage__binary = True
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        for path in ["test_binary.hbnb", "test_binary.hbnb.lock"]:
+            if os.path.exists(path):
+                os.remove(path)
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__binary,
+         FileStorage._FileStorage__loaded) = self.saved
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reload(self):
+        """Test that objects survive a save and reload."""
+        fs = FileStorage()
+        objs = [State(name="Alabama"), Place(name="Loft", max_guest=4),
+                BaseModel()]
+        for obj in objs:
+            fs.new(obj)
+        fs.save()
+        with open("test_binary.hbnb", "rb") as f:
+            self.assertEqual(f.read(4), b"HBNB")
+        FileStorage._FileStorage__objects = {}
+        fs.reload()
+        self.assertEqual(fs.count(), 3)
+        for obj in objs:
+            with self.subTest(cls=obj.__class__.__name__):
+                new = fs.get(obj.__class__, obj.id)
+                self.assertIsNot(new, obj)
+                self.assertEqual(new.to_dict(), obj.to_dict())
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the TestJournalDocs and TestJournal classes
+"""
+
+import inspect
+from models.engine import journal
+import os
+import pep8
+import unittest
+Journal = journal.Journal
+
+
+class TestJournalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Journal class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.journal_f = inspect.getmembers(Journal, inspect.isfunction)
+
+    def test_pep8_conformance_journal(self):
+        """Test that models/engine/journal.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_journal(self):
+        """Test tests/test_models/test_engine/test_journal.py conforms to
+        PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_journal_module_docstring(self):
+        """Test for the journal.py module docstring"""
+        self.assertIsNot(journal.__doc__, None,
+                         "journal.py needs a docstring")
+        self.assertTrue(len(journal.__doc__) >= 1,
+                        "journal.py needs a docstring")
+
+    def test_journal_class_docstring(self):
+        """Test for the Journal class docstring"""
+        self.assertIsNot(Journal.__doc__, None,
+                         "Journal class needs a docstring")
+        self.assertTrue(len(Journal.__doc__) >= 1,
+                        "Journal class needs a docstring")
+
+    def test_journal_func_docstrings(self):
+        """Test for the presence of docstrings in Journal methods"""
+        for func in self.journal_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestJournal(unittest.TestCase):
+    """Test the Journal class"""
+    def setUp(self):
+        """Start every test from an empty log"""
+        self.journal = Journal("test_journal.log")
+        self.journal.clear()
+
+    def tearDown(self):
+        """Remove the log files"""
+        self.journal.clear()
+
+    def test_append_replay(self):
+        """Test that appended records are replayed in order."""
+        self.journal.append([["+", "State.1", {"name": "a"}]])
+        self.journal.append([["-", "State.1"], ["+", "City.2", {}]])
+        self.assertEqual(list(self.journal.replay()),
+                         [["+", "State.1", {"name": "a"}],
+                          ["-", "State.1"], ["+", "City.2", {}]])
+        self.assertGreater(self.journal.size(), 0)
+
+    def test_truncated_line(self):
+        """Test that a partially written last record is skipped."""
+        self.journal.append([["-", "State.1"]])
+        with open(self.journal.path, 'a') as f:
+            f.write('["+", "State.2", {"na')
+        self.assertEqual(list(self.journal.replay()), [["-", "State.1"]])
+
+    def test_rotate(self):
+        """Test that rotated records are still replayed first."""
+        self.journal.append([["-", "State.1"]])
+        self.journal.rotate()
+        self.assertEqual(self.journal.size(), 0)
+        self.journal.append([["-", "State.2"]])
+        self.journal.rotate()
+        self.journal.append([["-", "State.3"]])
+        self.assertEqual(list(self.journal.replay()),
+                         [["-", "State.1"], ["-", "State.2"],
+                          ["-", "State.3"]])
+        self.journal.discard_old()
+        self.assertFalse(os.path.exists(self.journal.old_path))
+        self.assertEqual(list(self.journal.replay()), [["-", "State.3"]])
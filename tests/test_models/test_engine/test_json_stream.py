@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Contains the TestJsonStreamDocs and TestIterItems classes
+"""
+
+import inspect
+import io
+import json
+from models.engine import json_stream
+import pep8
+import unittest
+iter_items = json_stream.iter_items
+
+
+class TestJsonStreamDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_stream"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.reader_f = inspect.getmembers(json_stream._Reader,
+                                          inspect.isfunction)
+
+    def test_pep8_conformance_json_stream(self):
+        """Test that models/engine/json_stream.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_json_stream(self):
+        """Test tests/test_models/test_engine/test_json_stream.py conforms
+        to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_json_stream_module_docstring(self):
+        """Test for the json_stream.py module docstring"""
+        self.assertIsNot(json_stream.__doc__, None,
+                         "json_stream.py needs a docstring")
+        self.assertTrue(len(json_stream.__doc__) >= 1,
+                        "json_stream.py needs a docstring")
+
+    def test_iter_items_docstring(self):
+        """Test for the iter_items function docstring"""
+        self.assertIsNot(iter_items.__doc__, None,
+                         "iter_items needs a docstring")
+        self.assertTrue(len(iter_items.__doc__) >= 1,
+                        "iter_items needs a docstring")
+
+    def test_reader_func_docstrings(self):
+        """Test for the presence of docstrings in _Reader methods"""
+        for func in self.reader_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestIterItems(unittest.TestCase):
+    """Test the iter_items function"""
+    objects = {"State.1": {"__class__": "State", "name": 'New "York"'},
+               "Place.2": {"__class__": "Place", "latitude": 37.7749,
+                           "number_rooms": 12345678, "amenity_ids": []},
+               "Review.3": {"__class__": "Review", "text": "{[,:]}"}}
+
+    def test_items(self):
+        """Test that every pair is read, whatever the chunk size."""
+        for text in [json.dumps(self.objects),
+                     json.dumps(self.objects, indent=4)]:
+            for size in [1, 2, 7, 64, 1 << 16]:
+                with self.subTest(size=size):
+                    items = list(iter_items(io.StringIO(text), size))
+                    self.assertEqual(items, list(self.objects.items()))
+
+    def test_empty_object(self):
+        """Test that an empty object yields nothing."""
+        self.assertEqual(list(iter_items(io.StringIO(" {\n} "))), [])
+
+    def test_invalid(self):
+        """Test that truncated or invalid JSON raises ValueError."""
+        for text in ['', '{', '{"a": {}', '{"a" {}}', '[]', '{"a": {},}']:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(iter_items(io.StringIO(text), 2))